@@ -0,0 +1,111 @@
+"""Chart figures for app.py.
+
+Kept out of app_resources so plotly, pandas and the predictor are imported
+only when a prediction is shown (or by the background warm-up), never on a
+worker's first render. The chart data is cached by model fingerprint and
+inputs and shared by all sessions. Each run builds its own go.Figure from
+a copy, so no session can change a figure another session is drawing.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import metrics
+from price_surface import AREA_SWEEP, BASE_AREA_PER_BHK, BHK_OPTIONS
+
+FIGURE_CACHE_ENTRIES = 4096
+
+
+def _axis_title(text):
+    return dict(text=text, font=dict(size=14, color='#333333', family='Poppins'))
+
+
+# Static parts of the chart specs. Figures are built from plain dicts in one
+# go, which validates several times faster than add_trace/update_layout calls.
+BHK_CHART_LAYOUT = dict(
+    title=dict(text="Price Comparison by BHK (Standard Area: 600 sq.ft per bedroom)",
+               font=dict(size=18, color='#333333', family='Poppins')),
+    xaxis=dict(title=_axis_title("Property Type"),
+               tickfont=dict(size=12, color='#333333', family='Poppins')),
+    yaxis=dict(title=_axis_title("Price (Lakhs)"),
+               tickfont=dict(size=12, color='#333333', family='Poppins')),
+    plot_bgcolor='rgba(248,249,250,0.5)',
+    paper_bgcolor='rgba(255,255,255,0.98)',
+    font=dict(family="Poppins", size=12, color='#333333'),
+    height=450,
+    showlegend=False,
+    margin=dict(t=80, b=60, l=60, r=40))
+
+AREA_CHART_LAYOUT = dict(
+    title=dict(text="Price Trend Based on Property Size",
+               font=dict(size=18, color='#333333', family='Poppins')),
+    xaxis=dict(title=_axis_title("Area (sq.ft)"),
+               tickfont=dict(size=12, color='#333333', family='Poppins'),
+               gridcolor='rgba(200,200,200,0.3)'),
+    yaxis=dict(title=_axis_title("Price (Lakhs)"),
+               tickfont=dict(size=12, color='#333333', family='Poppins'),
+               gridcolor='rgba(200,200,200,0.3)'),
+    plot_bgcolor='rgba(248,249,250,0.5)',
+    paper_bgcolor='rgba(255,255,255,0.98)',
+    font=dict(family="Poppins", size=12, color='#333333'),
+    height=450,
+    margin=dict(t=80, b=60, l=60, r=40),
+    hovermode='x unified')
+
+BHK_LABELS = [f"{b} BHK" for b in BHK_OPTIONS]
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _bhk_comparison_trace(fingerprint, location, area_type, bath, balcony, bhk, _predictor, _surface):
+    # Calculate realistic area for each BHK (typical: 600 sq.ft per bedroom)
+    # 1 BHK: ~600 sqft, 2 BHK: ~1200 sqft, 3 BHK: ~1800 sqft, etc.
+    adjusted_areas = BASE_AREA_PER_BHK * BHK_OPTIONS
+
+    # Predict all BHK options in one batch with matching bathroom count
+    # Served from the precomputed surface when available
+    prices_by_bhk = _surface and _surface.bhk_comparison(location, area_type, bath, balcony)
+    if prices_by_bhk is None:
+        prices_by_bhk = _predictor.predict_batch(pd.DataFrame({
+            "total_sqft": adjusted_areas,
+            "bath": np.minimum(BHK_OPTIONS, bath),  # At least 1 bathroom per BHK
+            "balcony": balcony, "bhk": BHK_OPTIONS,
+            "location": location, "area_type": area_type}))
+
+    return dict(
+        type='bar', x=BHK_LABELS, y=prices_by_bhk,
+        marker=dict(color=np.where(BHK_OPTIONS == bhk, '#667eea', '#b8c5f2')),
+        text=[f"₹{p:.2f}L<br>{int(a)} sq.ft" for p, a in zip(prices_by_bhk, adjusted_areas)],
+        textposition='outside',
+        textfont=dict(size=12, color='#333333', family='Poppins'),
+        hovertemplate='<b>%{x}</b><br>Price: ₹%{y:.2f}L<br>Area: %{text}<extra></extra>')
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _area_trend_trace(fingerprint, location, area_type, bath, balcony, bhk, _predictor, _surface):
+    prices_by_area = _surface and _surface.area_trend(location, area_type, bath, balcony, bhk)
+    if prices_by_area is None:
+        prices_by_area = _predictor.predict_batch(pd.DataFrame({
+            "total_sqft": AREA_SWEEP, "bath": bath, "balcony": balcony, "bhk": bhk,
+            "location": location, "area_type": area_type}))
+
+    return dict(
+        type='scatter', x=AREA_SWEEP, y=prices_by_area,
+        mode='lines+markers',
+        line=dict(color='#667eea', width=4),
+        marker=dict(size=10, color='#764ba2', line=dict(color='white', width=2)),
+        fill='tozeroy',
+        fillcolor='rgba(102,126,234,0.3)',
+        hovertemplate='<b>Area:</b> %{x:.0f} sq.ft<br><b>Price:</b> ₹%{y:.2f}L<extra></extra>')
+
+
+def bhk_comparison_figure(fingerprint, location, area_type, bath, balcony, bhk, predictor, surface):
+    with metrics.STAGE_LATENCY.time("chart"):
+        bar = _bhk_comparison_trace(fingerprint, location, area_type, bath, balcony, bhk, predictor, surface)
+        return go.Figure(dict(data=[bar], layout=BHK_CHART_LAYOUT))
+
+
+def area_trend_figure(fingerprint, location, area_type, bath, balcony, bhk, predictor, surface):
+    with metrics.STAGE_LATENCY.time("chart"):
+        line = _area_trend_trace(fingerprint, location, area_type, bath, balcony, bhk, predictor, surface)
+        return go.Figure(dict(data=[line], layout=AREA_CHART_LAYOUT))
@@ -0,0 +1,149 @@
+"""Cached resources for app.py.
+
+Defined in a module rather than in the app script so the cache decorators
+run once per process instead of on every rerun.
+
+Only streamlit and numpy are imported up front: the predictor (pandas,
+scipy, the model itself) and the chart module (plotly) are loaded by the
+loaders below, which start_warmup() runs on a background thread once the
+first page has rendered. A session that predicts before the warm-up is done
+simply waits on the same cache entry. The loaders the warm-up calls don't
+show a spinner: that thread has no script context to draw one in, and
+the results section shows its own.
+
+When a model registry exists (model_registry.py), the model comes from a
+ModelWatcher instead of a single cached load, so activating a new version
+reaches every running worker without a restart. The registry is looked for
+on every run, so one created after the workers started is picked up too.
+Each script run takes one predictor reference and uses it throughout.
+The live model answers through the prediction cache; while a shadow
+version is set, the candidate is still scored on every prediction, cache
+hits included.
+"""
+import os
+import threading
+
+import streamlit as st
+
+import metrics
+from model_artifact import ARTIFACT_PATH, read_feature_names
+from model_registry import ModelRegistry, ModelWatcher
+
+
+def get_model_watcher():
+    """The process's registry watcher, or None while there is no registry.
+
+    "No registry" is never cached, so creating models/ reaches running workers.
+    """
+    if not ModelRegistry().exists():
+        return None
+    return load_model_watcher()
+
+
+@st.cache_resource(show_spinner=False)
+def load_model_watcher():
+    from prediction_cache import CachedPredictor
+
+    # Polls the registry and swaps models in place, each behind the shared cache
+    comparables = load_comparables()
+    cache = get_prediction_cache()
+    with metrics.STAGE_LATENCY.time("model_load"):
+        return ModelWatcher(ModelRegistry(), comparables=comparables,
+                            wrap=lambda predictor: CachedPredictor(predictor, cache)).start()
+
+
+@st.cache_resource(show_spinner=False)
+def load_predictor():
+    from predictor import PricePredictor
+
+    comparables = load_comparables()
+    with metrics.STAGE_LATENCY.time("model_load"):
+        # Prefer the pickle-free, memory-mapped artifact when it has been exported
+        if os.path.exists(ARTIFACT_PATH):
+            return PricePredictor.from_files(ARTIFACT_PATH, comparables=comparables)
+        return PricePredictor.from_files(comparables=comparables)
+
+
+@st.cache_resource
+def load_comparables():
+    from comparables import ComparablesIndex
+    from preprocessing import AFTER_OUTLIERS_PATH
+
+    # Per-location index over the cleaned listings; the table is skipped without them
+    if not os.path.exists(AFTER_OUTLIERS_PATH):
+        return None
+    return ComparablesIndex.from_csv(AFTER_OUTLIERS_PATH)
+
+
+@st.cache_resource
+def start_metrics_exporters():
+    # /metrics endpoint and/or periodic log dump, per METRICS_PORT / METRICS_LOG_INTERVAL
+    return metrics.start_from_env()
+
+
+@st.cache_resource(show_spinner=False)
+def get_prediction_cache():
+    from prediction_cache import PredictionCache
+
+    # One cache per server process, shared by every session
+    return PredictionCache(maxsize=100_000)
+
+
+def get_predictor():
+    """The current model behind the shared prediction cache."""
+    from prediction_cache import CachedPredictor
+
+    watcher = get_model_watcher()
+    if watcher is not None:
+        # Already cached, and in shadow mode also mirrored to the candidate
+        return watcher.predictor
+    return CachedPredictor(load_predictor(), get_prediction_cache())
+
+
+def model_artifact_path():
+    """The artifact the current model is read from: the registry's active version, else ARTIFACT_PATH."""
+    registry = ModelRegistry()
+    version = registry.active_version()
+    if version is not None:
+        return registry.artifact_path(version)
+    return ARTIFACT_PATH if os.path.exists(ARTIFACT_PATH) else None
+
+
+@st.cache_resource(show_spinner=False)
+def load_price_surface(fingerprint):
+    from price_surface import SURFACE_PATH, PriceSurface
+
+    # Precomputed chart grids; ignored if missing or built for another model
+    try:
+        surface = PriceSurface.load(SURFACE_PATH)
+    except FileNotFoundError:
+        return None
+    return surface if surface.fingerprint == fingerprint else None
+
+
+@st.cache_resource
+def category_options(artifact_path):
+    # Sidebar choices, read from the artifact header so the first render
+    # waits for neither the model nor pandas
+    if artifact_path is not None:
+        feature_names = read_feature_names(artifact_path)
+    else:
+        feature_names = load_predictor().feature_names
+    return tuple(sorted(name[len(prefix):] for name in feature_names if name.startswith(prefix))
+                 for prefix in ("location_", "area_type_"))
+
+
+def warm_up():
+    """Load everything a first prediction needs: model, caches, chart module."""
+    predictor = get_predictor()
+    predictor.location_resolver.bucketed  # raw names grouped as "Other", for free-text locations
+    load_price_surface(predictor.fingerprint)
+    import app_charts  # noqa: F401  (plotly)
+
+
+@st.cache_resource
+def start_warmup():
+    # Once per process; call it after the page is drawn so it never delays the first render
+    thread = threading.Thread(target=warm_up, name="app-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,289 @@
+"""Static CSS and HTML for app.py.
+
+Kept in a module so the strings are built once per server process rather
+than on every script rerun.
+"""
+
+# Page-wide theme
+GLOBAL_CSS = """
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700;800&display=swap');
+    
+    /* Global Font */
+    html, body, [class*="css"], .stMarkdown, p, h1, h2, h3, h4, h5, h6, span, div {
+        font-family: 'Poppins', sans-serif !important;
+    }
+    
+    /* Main App Background */
+    .stApp {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+    }
+    
+    /* Main Content Area */
+    .main .block-container {
+        padding-top: 2rem;
+        padding-bottom: 2rem;
+    }
+    
+    /* Sidebar Styling */
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, #ffffff 0%, #f8f9fa 100%) !important;
+    }
+    
+    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h1 {
+        color: #667eea !important;
+        font-weight: 800 !important;
+        font-size: 1.8rem !important;
+    }
+    
+    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h3 {
+        color: #764ba2 !important;
+        font-weight: 600 !important;
+        font-size: 1.1rem !important;
+        margin-top: 1.5rem !important;
+    }
+    
+    /* Sidebar Labels */
+    [data-testid="stSidebar"] label {
+        color: #333333 !important;
+        font-weight: 600 !important;
+        font-size: 0.95rem !important;
+    }
+    
+    /* Slider Styling */
+    .stSlider > div > div > div > div {
+        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%) !important;
+    }
+    
+    .stSlider [data-baseweb="slider"] {
+        background: #e0e0e0 !important;
+    }
+    
+    /* Number Input Styling */
+    .stNumberInput input {
+        background: #f8f9fa !important;
+        border: 2px solid #e0e0e0 !important;
+        border-radius: 8px !important;
+        color: #333333 !important;
+        font-weight: 600 !important;
+    }
+    
+    .stNumberInput input:focus {
+        border-color: #667eea !important;
+        box-shadow: 0 0 0 2px rgba(102, 126, 234, 0.2) !important;
+    }
+    
+    /* Select Box Styling */
+    .stSelectbox > div > div {
+        background: #f8f9fa !important;
+        border: 2px solid #e0e0e0 !important;
+        border-radius: 8px !important;
+    }
+    
+    .stSelectbox [data-baseweb="select"] {
+        background: #f8f9fa !important;
+    }
+    
+    .stSelectbox [data-baseweb="select"] > div {
+        color: #333333 !important;
+        font-weight: 600 !important;
+    }
+    
+    /* Button Styling */
+    .stButton > button {
+        width: 100% !important;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+        color: white !important;
+        border: none !important;
+        padding: 0.9rem 1.5rem !important;
+        font-size: 1.15rem !important;
+        font-weight: 700 !important;
+        border-radius: 12px !important;
+        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4) !important;
+        transition: all 0.3s ease !important;
+        text-transform: uppercase !important;
+        letter-spacing: 1px !important;
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-3px) !important;
+        box-shadow: 0 10px 30px rgba(102, 126, 234, 0.6) !important;
+        background: linear-gradient(135deg, #764ba2 0%, #667eea 100%) !important;
+    }
+    
+    /* Metric Cards */
+    [data-testid="stMetricValue"] {
+        font-size: 2.2rem !important;
+        font-weight: 800 !important;
+        color: #667eea !important;
+    }
+    
+    [data-testid="stMetricLabel"] {
+        font-size: 1.1rem !important;
+        font-weight: 600 !important;
+        color: #333333 !important;
+    }
+    
+    [data-testid="metric-container"] {
+        background: white !important;
+        padding: 1.5rem !important;
+        border-radius: 15px !important;
+        box-shadow: 0 5px 20px rgba(0, 0, 0, 0.1) !important;
+        border: 2px solid rgba(102, 126, 234, 0.2) !important;
+    }
+    
+    /* Horizontal Rule */
+    hr {
+        border: none !important;
+        height: 2px !important;
+        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.5), transparent) !important;
+        margin: 2rem 0 !important;
+    }
+    
+    /* Dataframe Styling */
+    [data-testid="stDataFrame"] {
+        background: white !important;
+        border-radius: 12px !important;
+        overflow: hidden !important;
+    }
+    
+    /* Remove Streamlit Branding */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+</style>
+"""
+
+# Sidebar
+SIDEBAR_HEADER = """
+    <div style='text-align:center; padding:1.5rem 0; background:linear-gradient(135deg,#667eea,#764ba2); 
+    border-radius:15px; margin-bottom:1.5rem;'>
+    <h1 style='color:white; font-size:1.8rem; margin:0; font-weight:800;'>🏠 Property Config</h1>
+    </div>
+"""
+
+SIDEBAR_TIP = """
+    <div style='background:linear-gradient(135deg,#f093fb,#f5576c); padding:1.5rem; 
+    border-radius:12px; margin-top:2rem; text-align:center;'>
+    <p style='color:white; margin:0; font-size:0.85rem; font-weight:600;'>
+    💡 TIP: Adjust parameters to see<br>how they affect the price!</p>
+    </div>
+"""
+
+
+def sidebar_section(label, first=False):
+    margin = "margin-bottom:1rem" if first else "margin:1.5rem 0 1rem 0"
+    return f"""
+    <div style='background:#f0f2f6; padding:1rem; border-radius:10px; {margin};'>
+    <p style='margin:0; color:#667eea; font-weight:600; font-size:0.9rem;'>
+    {label}</p>
+    </div>
+    """
+
+
+SECTION_SIZE = sidebar_section("📐 PROPERTY SIZE", first=True)
+SECTION_ROOMS = sidebar_section("🛏 ROOMS & AMENITIES")
+SECTION_LOCATION = sidebar_section("📍 LOCATION DETAILS")
+SECTION_TYPE = sidebar_section("🏢 PROPERTY TYPE")
+
+# Main page
+PAGE_HEADER = """
+<div style='text-align:center; padding:3rem 2rem 2rem 2rem; background:rgba(255,255,255,0.98); border-radius:25px; 
+margin-bottom:2rem; box-shadow:0 15px 50px rgba(0,0,0,0.25); position:relative; overflow:visible;'>
+<div style='position:absolute; top:-50px; right:-50px; width:200px; height:200px; 
+background:linear-gradient(135deg,#667eea,#764ba2); border-radius:50%; opacity:0.1; z-index:0;'></div>
+<div style='position:absolute; bottom:-30px; left:-30px; width:150px; height:150px; 
+background:linear-gradient(135deg,#f093fb,#f5576c); border-radius:50%; opacity:0.1; z-index:0;'></div>
+
+<h1 style='color:#667eea; font-size:3.5rem; margin-bottom:0.8rem; font-weight:900; position:relative; z-index:1;'>
+🏠 Bengaluru House Price Predictor</h1>
+<p style='color:#666; font-size:1.3rem; margin:0; font-weight:500; position:relative; z-index:1;'>
+✨ AI-Powered Real Estate Price Estimation ✨</p>
+<div style='margin-top:1.5rem; display:inline-block; background:linear-gradient(135deg,#667eea,#764ba2); 
+padding:0.5rem 2rem; border-radius:20px; position:relative; z-index:1;'>
+<p style='color:white; margin:0; font-size:0.9rem; font-weight:600;'>
+🎯 Accurate • 🚀 Fast • 💯 Reliable</p>
+</div>
+</div>
+
+<div style='background:linear-gradient(135deg,#667eea,#764ba2); padding:1.5rem 2rem; border-radius:20px; 
+margin-bottom:2rem; box-shadow:0 10px 30px rgba(102,126,234,0.3); text-align:center;'>
+<p style='margin:0; color:rgba(255,255,255,0.9); font-size:0.85rem; font-weight:600; 
+text-transform:uppercase; letter-spacing:1.5px; margin-bottom:0.8rem;'>👥 Developed By</p>
+<p style='margin:0; color:white; font-size:1.1rem; font-weight:700; line-height:1.8;'>
+Utpal Raj • V Srujan • Surya</p>
+<p style='margin:1rem 0 0 0; color:rgba(255,255,255,0.9); font-size:0.85rem; font-weight:600;'>
+🎓 Under guidance of <span style='color:white; font-weight:800;'>Sajitha Krishnan</span></p>
+</div>
+"""
+
+# Shown before the first prediction
+WELCOME_HTML = """
+        <div style='background:rgba(255,255,255,0.95); padding:3rem 2rem; border-radius:20px; 
+        box-shadow:0 10px 30px rgba(0,0,0,0.1); height:100%;'>
+        <h2 style='color:#667eea; font-size:2.2rem; margin-bottom:1.5rem; font-weight:800;'>
+        👈 Get Started</h2>
+        <p style='color:#666; font-size:1.1rem; line-height:1.8; margin-bottom:2rem;'>
+        Configure your property details in the sidebar and click 
+        <strong style='color:#667eea;'>"PREDICT PRICE NOW"</strong> to get instant AI-powered estimates!</p>
+        <div style='background:linear-gradient(135deg,#667eea,#764ba2); padding:1.5rem; border-radius:12px; margin-top:2rem;'>
+        <p style='color:white; margin:0; font-size:1rem; font-weight:600; text-align:center;'>
+        🎯 Powered by Advanced Machine Learning</p>
+        </div>
+        </div>
+"""
+
+FEATURES_HTML = """
+        <div style='background:rgba(255,255,255,0.95); padding:3rem 2rem; border-radius:20px; 
+        box-shadow:0 10px 30px rgba(0,0,0,0.1); height:100%;'>
+        <h3 style='color:#764ba2; margin-top:0; font-size:1.8rem; font-weight:700;'>✨ Key Features</h3>
+        <div style='margin:1.5rem 0;'>
+        <div style='display:flex; align-items:center; margin:1rem 0;'>
+        <div style='background:#667eea; width:40px; height:40px; border-radius:10px; display:flex; 
+        align-items:center; justify-content:center; margin-right:1rem;'>
+        <span style='font-size:1.5rem;'>⚡</span>
+        </div>
+        <div>
+        <p style='margin:0; color:#333; font-weight:600;'>Real-time Predictions</p>
+        <p style='margin:0; color:#999; font-size:0.9rem;'>Instant price estimates</p>
+        </div>
+        </div>
+        <div style='display:flex; align-items:center; margin:1rem 0;'>
+        <div style='background:#764ba2; width:40px; height:40px; border-radius:10px; display:flex; 
+        align-items:center; justify-content:center; margin-right:1rem;'>
+        <span style='font-size:1.5rem;'>📊</span>
+        </div>
+        <div>
+        <p style='margin:0; color:#333; font-weight:600;'>Interactive Charts</p>
+        <p style='margin:0; color:#999; font-size:0.9rem;'>Visual price comparisons</p>
+        </div>
+        </div>
+        <div style='display:flex; align-items:center; margin:1rem 0;'>
+        <div style='background:#f093fb; width:40px; height:40px; border-radius:10px; display:flex; 
+        align-items:center; justify-content:center; margin-right:1rem;'>
+        <span style='font-size:1.5rem;'>💡</span>
+        </div>
+        <div>
+        <p style='margin:0; color:#333; font-weight:600;'>Detailed Insights</p>
+        <p style='margin:0; color:#999; font-size:0.9rem;'>Comprehensive analysis</p>
+        </div>
+        </div>
+        <div style='display:flex; align-items:center; margin:1rem 0;'>
+        <div style='background:#f5576c; width:40px; height:40px; border-radius:10px; display:flex; 
+        align-items:center; justify-content:center; margin-right:1rem;'>
+        <span style='font-size:1.5rem;'>📈</span>
+        </div>
+        <div>
+        <p style='margin:0; color:#333; font-weight:600;'>Area Impact Analysis</p>
+        <p style='margin:0; color:#999; font-size:0.9rem;'>Size vs price trends</p>
+        </div>
+        </div>
+        </div>
+        </div>
+"""
+
+FOOTER_HTML = """
+<div style='text-align:center; color:white; padding:1rem;'>
+<p style='margin:0; font-size:0.9rem;'>🏠 Bengaluru House Price Predictor | Powered by Machine Learning</p>
+</div>
+"""
@@ -0,0 +1,146 @@
+"""Streamlit script execution time per rerun, for the current app.py and
+optionally the app.py of an earlier git revision (before/after comparison).
+
+Each interaction is replayed through streamlit's AppTest runner, timing only
+the execution of the script body (or of the fragment being rerun) on the
+script thread. Widget edits inside a fragment are replayed as
+fragment-scoped reruns, the way a live server executes them.
+
+Example:
+    python -m benchmarks.bench_app --ref HEAD~1
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from functools import partial
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQFT_VALUES = [1000, 1200, 1500, 1800]
+INPUT_FRAGMENT = "property_inputs"
+
+
+def _quiet_streamlit():
+    import logging
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    logging.getLogger("streamlit").setLevel(logging.CRITICAL)
+
+
+def _fragment_id(at, name):
+    """Id of the fragment wrapping the function ``name``, or None."""
+    storage = getattr(at, "_fragment_storage", None)
+    for fragment_id, wrapped in getattr(storage, "_fragments", {}).items():
+        cells = [cell.cell_contents for cell in wrapped.__closure__ or ()]
+        if any(getattr(cell, "__name__", None) == name for cell in cells):
+            return fragment_id
+    return None
+
+
+def _timed_run(at, fragment_id=None):
+    """Rerun the app; returns seconds spent executing script code."""
+    from streamlit.runtime.scriptrunner import RerunData
+    import streamlit.runtime.scriptrunner.script_runner as script_runner
+    import streamlit.testing.v1.local_script_runner as local_script_runner
+
+    exec_func = script_runner.exec_func_with_error_handling
+    elapsed = []
+
+    def timed_exec(func, ctx):
+        start = time.perf_counter()
+        try:
+            return exec_func(func, ctx)
+        finally:
+            elapsed.append(time.perf_counter() - start)
+
+    rerun_data = RerunData if fragment_id is None else partial(RerunData, fragment_id_queue=[fragment_id])
+    with mock.patch.object(local_script_runner, "RerunData", rerun_data), \
+            mock.patch.object(script_runner, "exec_func_with_error_handling", timed_exec):
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return sum(elapsed)
+
+
+def bench_script(path, repeats):
+    """Median seconds per rerun for each interaction."""
+    import numpy as np
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(path, default_timeout=120)
+    _timed_run(at)  # model load and cache warm-up
+    fragment_id = _fragment_id(at, INPUT_FRAGMENT)
+    locations = at.selectbox[1].options[:repeats]
+
+    def edit_input(i):
+        at.slider[0].set_value(SQFT_VALUES[i % len(SQFT_VALUES)])
+        return _timed_run(at, fragment_id)
+
+    def predict_new(i):
+        at.selectbox[1].set_value(locations[i % len(locations)])
+        at.button[0].click()
+        return _timed_run(at)
+
+    def predict_repeat(i):
+        at.button[0].click()
+        return _timed_run(at)
+
+    scenarios = {
+        "full page rerun": lambda i: _timed_run(at),
+        "edit input": edit_input,
+        "predict (new inputs)": predict_new,
+        "predict (repeat)": predict_repeat,
+    }
+    timings = {}
+    for name, step in scenarios.items():
+        _timed_run(at)  # fragment reruns leave a partial element tree; start each from a full page
+        timings[name] = float(np.median([step(i) for i in range(repeats)]))
+    return timings
+
+
+def _script_at(ref):
+    """Write app.py as of ``ref`` next to the current one, so its imports resolve."""
+    source = subprocess.run(["git", "show", f"{ref}:app.py"], cwd=REPO_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    handle, path = tempfile.mkstemp(prefix=".bench_app_", suffix=".py", dir=REPO_DIR, text=True)
+    with os.fdopen(handle, "w") as f:
+        f.write(source)
+    return path
+
+
+def run(refs, repeats):
+    # numpy/pandas are imported in the functions that need them, so the cold-start
+    # scripts (suite.py, cold_start.py) that reuse the helpers above don't preload them
+    import pandas as pd
+
+    _quiet_streamlit()
+    os.chdir(REPO_DIR)
+    results = {}
+    for ref in refs:
+        path = os.path.join(REPO_DIR, "app.py") if ref is None else _script_at(ref)
+        try:
+            timings = bench_script(path, repeats)
+        finally:
+            if ref is not None:
+                os.remove(path)
+        results[ref or "working tree"] = {name: s * 1000 for name, s in timings.items()}
+    table = pd.DataFrame(results)
+    table.index.name = "ms per rerun"
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time Streamlit reruns of app.py per interaction.")
+    parser.add_argument("--ref", action="append", default=[],
+                        help="also benchmark app.py at this git revision (repeatable)")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+    table = run(args.ref + [None], args.repeats)
+    print(table.to_string(float_format="%.1f"))
+
+
+if __name__ == "__main__":
+    main()
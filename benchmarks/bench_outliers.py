@@ -0,0 +1,109 @@
+"""Outlier-removal benchmark: group-vectorised vs. the notebook's loops.
+
+Generates synthetic cleaned listings (location, bhk, total_sqft, price,
+price_per_sqft) at several sizes, times preprocessing.remove_pps_outliers /
+remove_bhk_outliers, and checks they return exactly what the original
+per-location loops return (the loops are only run up to
+--reference-max-rows because they grow quadratically).
+
+Example:
+    python -m benchmarks.bench_outliers --sizes 10000 1000000 10000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import remove_bhk_outliers, remove_pps_outliers
+
+
+# Reference implementations, verbatim from Data_Preprocessing_EDA.ipynb
+def reference_remove_pps_outliers(df):
+    df_out = pd.DataFrame()
+    for key, group in df.groupby("location"):
+        m = group.price_per_sqft.mean()
+        sd = group.price_per_sqft.std()
+        reduced = group[(group.price_per_sqft > (m - sd)) &
+                        (group.price_per_sqft < (m + sd))]
+        df_out = pd.concat([df_out, reduced], ignore_index=True)
+    return df_out
+
+
+def reference_remove_bhk_outliers(df):
+    exclude = np.array([])
+
+    for location, loc_df in df.groupby("location"):
+        bhk_stats = {}
+
+        for bhk, bhk_df in loc_df.groupby("bhk"):
+            bhk_stats[bhk] = {
+                "mean": bhk_df.price_per_sqft.mean(),
+                "std": bhk_df.price_per_sqft.std()
+            }
+
+        for bhk, bhk_df in loc_df.groupby("bhk"):
+            if (bhk-1) in bhk_stats:
+                if bhk_stats[bhk]["mean"] < bhk_stats[bhk-1]["mean"]:
+                    exclude = np.append(exclude, bhk_df.index.values)
+
+    return df.drop(exclude)
+
+
+def synthetic_cleaned(n_rows, n_locations=250, seed=0):
+    """Cleaned-listing columns with per-location price levels and noisy pps."""
+    rng = np.random.default_rng(seed)
+    location_ids = rng.zipf(1.3, n_rows) % n_locations
+    base_pps = rng.uniform(3000, 15000, n_locations)
+    bhk = rng.choice([1, 2, 3, 4, 5, 6], n_rows, p=[0.1, 0.4, 0.35, 0.1, 0.03, 0.02])
+    total_sqft = np.round(bhk * rng.normal(550, 120, n_rows).clip(300, None))
+    pps = base_pps[location_ids] * rng.lognormal(0, 0.35, n_rows) * (1 + 0.03 * rng.standard_normal(n_rows) * bhk)
+    price = np.round(total_sqft * pps / 100000, 2)
+    return pd.DataFrame({
+        "location": np.array([f"Location {i}" for i in range(n_locations)], dtype=object)[location_ids],
+        "total_sqft": total_sqft,
+        "bhk": bhk,
+        "price": price,
+        "price_per_sqft": price * 100000 / total_sqft,
+    })
+
+
+def _timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+
+def run(sizes, reference_max_rows):
+    rows = []
+    for n in sizes:
+        df = synthetic_cleaned(n)
+        pps_out, pps_s = _timed(remove_pps_outliers, df)
+        bhk_out, bhk_s = _timed(remove_bhk_outliers, pps_out)
+        row = {"rows": n, "pps_s": pps_s, "bhk_s": bhk_s,
+               "ns_per_row": (pps_s + bhk_s) / n * 1e9, "ref_pps_s": None, "ref_bhk_s": None,
+               "identical": None}
+        if n <= reference_max_rows:
+            ref_pps, row["ref_pps_s"] = _timed(reference_remove_pps_outliers, df)
+            ref_bhk, row["ref_bhk_s"] = _timed(reference_remove_bhk_outliers, ref_pps)
+            row["identical"] = pps_out.equals(ref_pps) and bhk_out.equals(ref_bhk)
+        rows.append(row)
+        print(f"{n:>12,} rows: {pps_s + bhk_s:.3f}s vectorised"
+              + (f", {row['ref_pps_s'] + row['ref_bhk_s']:.3f}s reference, identical={row['identical']}"
+                 if row["identical"] is not None else ""))
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark outlier removal at several scales.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--reference-max-rows", type=int, default=1_000_000,
+                        help="largest size to also run (and compare against) the notebook loops")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, args.reference_max_rows)
+    print()
+    print(results.to_string(index=False, float_format="%.4f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Startup profile of a fresh app.py worker: where time goes before the first
+render and before the first prediction.
+
+Runs the app in a new interpreter under ``python -X importtime`` and splits
+the run into phases:
+
+    startup        interpreter + streamlit (what any worker pays)
+    first render   first run of app.py, without a prediction
+    warm-up        background load of the model and chart libraries
+    first predict  first run with a prediction, after the warm-up
+
+For each phase it reports the wall time and the import time by top-level
+package, followed by the stage timings recorded in metrics.py (model_load,
+chart, render). Pass --no-wait to predict right after the first render,
+as a user clicking straight away would, instead of after the warm-up.
+
+Example:
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --no-wait --top 5
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ["startup", "first render", "warm-up", "first predict"]
+MARKER = "@@phase "
+PREDICTION_INPUTS = {"total_sqft": 1200, "bhk": 2, "bath": 2, "balcony": 1,
+                     "location": "Whitefield", "area_type": "Super built-up  Area"}
+
+PROFILE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+
+def phase(name):
+    print({marker!r} + name, file=sys.stderr, flush=True)
+
+from benchmarks.bench_app import _quiet_streamlit, _timed_run
+_quiet_streamlit()
+from streamlit.testing.v1 import AppTest
+timings = {{"startup": time.perf_counter() - start}}
+phase("first render")
+at = AppTest.from_file("app.py", default_timeout=600)
+timings["first render"] = _timed_run(at)
+phase("warm-up")
+import app_resources
+warm_start = time.perf_counter()
+if {wait!r}:
+    app_resources.start_warmup().join()
+timings["warm-up"] = time.perf_counter() - warm_start
+phase("first predict")
+at.session_state["prediction_inputs"] = {inputs!r}
+timings["first predict"] = _timed_run(at)
+phase("end")
+
+import metrics
+stages = {{stage: metrics.STAGE_LATENCY.labels(stage).sum
+          for stage in ("model_load", "encode", "predict", "chart", "render")}}
+print(json.dumps({{"timings": timings, "stages": stages}}))
+"""
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)")
+
+
+def parse_imports(stderr):
+    """{phase: {top-level package: self import seconds}} from -X importtime output."""
+    imports = defaultdict(lambda: defaultdict(float))
+    current = PHASES[0]
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            current = line[len(MARKER):]
+            continue
+        match = _IMPORT_LINE.match(line)
+        if match:
+            imports[current][match.group(2).split(".")[0]] += int(match.group(1)) / 1e6
+    return imports
+
+
+def profile(wait=True, importtime=True):
+    """{"timings": {phase: s}, "stages": {stage: s}, "imports": {phase: {package: s}}}"""
+    script = PROFILE_SCRIPT.format(marker=MARKER, wait=wait, inputs=PREDICTION_INPUTS)
+    flags = ["-X", "importtime"] if importtime else []
+    result = subprocess.run([sys.executable, *flags, "-c", script], cwd=REPO_DIR,
+                            check=True, capture_output=True, text=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["imports"] = parse_imports(result.stderr)
+    return report
+
+
+def format_report(report, top=8):
+    lines = []
+    for phase in PHASES:
+        imports = report["imports"].get(phase, {})
+        total = sum(imports.values())
+        lines.append(f"{phase:<14} {report['timings'][phase] * 1000:>9.1f} ms   "
+                     f"(imports {total * 1000:.1f} ms)")
+        for package, seconds in sorted(imports.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"    {package:<28} {seconds * 1000:>9.1f} ms")
+    lines.append("stages (metrics.py)")
+    for stage, seconds in report["stages"].items():
+        lines.append(f"    {stage:<28} {seconds * 1000:>9.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile imports and first render of a fresh app.py worker.")
+    parser.add_argument("--no-wait", dest="wait", action="store_false",
+                        help="predict right after the first render instead of after the warm-up")
+    parser.add_argument("--top", type=int, default=8, help="packages listed per phase")
+    args = parser.parse_args(argv)
+    print(format_report(profile(args.wait), args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Benchmark suite: inference, preprocessing and training at several scales.
+
+Times, on synthetic raw listings (benchmarks.synthetic) of each size:
+
+    parse_sqft       preprocessing.parse_total_sqft on the raw total_sqft column
+    remove_outliers  preprocessing.remove_outliers on the cleaned listings
+    one_hot          train.encode_features (fit + transform to CSR)
+    fit_linear       LinearRegression fit on that matrix, as train.py configures it
+    predict_batch    PricePredictor.predict_batch over the cleaned listings
+
+and once per run, independent of size:
+
+    predict_price      SINGLE_PREDICTIONS single-row PricePredictor.predict_price calls
+    app_cold_start     fresh interpreter → first full run of app.py (AppTest)
+    app_first_predict  fresh interpreter → first render → prediction clicked
+                       straight away (benchmarks.cold_start --no-wait)
+
+Each timing is the best of --repeats runs (one run from SINGLE_RUN_ROWS rows
+up, where noise is small next to the timings). Results go to a JSON file;
+with a baseline file (from an earlier --save-baseline run) every timing is
+compared against it, and the run exits non-zero if any is slower by more
+than --threshold (timings under --noise-floor seconds are never flagged).
+
+Example:
+    python -m benchmarks.suite --sizes 10000 1000000 --save-baseline
+    python -m benchmarks.suite --sizes 10000 1000000     # later: compare
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_raw
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_PATH = "bench_results.json"
+BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+SINGLE_PREDICTIONS = 20_000
+SINGLE_RUN_ROWS = 1_000_000
+
+COLD_START_SCRIPT = """
+from benchmarks.bench_app import _quiet_streamlit, _timed_run
+_quiet_streamlit()
+from streamlit.testing.v1 import AppTest
+_timed_run(AppTest.from_file("app.py", default_timeout=600))
+"""
+
+
+def _best_of(func, repeats):
+    """(result of the last call, fastest wall time in seconds)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def bench_predict_price(predictor, repeats):
+    rng = np.random.default_rng(0)
+    locations = predictor.categories("location")
+    area_types = predictor.categories("area_type")
+    calls = [(float(rng.integers(500, 4000)), int(rng.integers(1, 5)), int(rng.integers(0, 4)),
+              int(rng.integers(1, 6)), locations[rng.integers(len(locations))],
+              area_types[rng.integers(len(area_types))]) for _ in range(SINGLE_PREDICTIONS)]
+
+    def run():
+        for args in calls:
+            predictor.predict_price(*args)
+
+    return _best_of(run, repeats)[1]
+
+
+def bench_app_cold_start(repeats):
+    def run():
+        subprocess.run([sys.executable, "-c", COLD_START_SCRIPT], cwd=REPO_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    return _best_of(run, repeats)[1]
+
+
+def bench_app_first_predict(repeats):
+    from benchmarks.cold_start import profile
+
+    def run():
+        timings = profile(wait=False, importtime=False)["timings"]
+        return timings["startup"] + timings["first render"] + timings["first predict"]
+
+    return min(run() for _ in range(repeats))
+
+
+def bench_size(n_rows, predictor, repeats):
+    """Seconds per step on ``n_rows`` synthetic raw listings."""
+    from sklearn.linear_model import LinearRegression
+
+    from features import normalize_availability
+    from predictor import INPUT_COLUMNS
+    from preprocessing import clean_listings, parse_total_sqft, remove_outliers
+    from train import CANDIDATES, encode_features
+
+    raw = synthetic_raw(n_rows)
+    repeats = 1 if n_rows >= SINGLE_RUN_ROWS else repeats
+    timings = {}
+    _, timings["parse_sqft"] = _best_of(lambda: parse_total_sqft(raw["total_sqft"]), repeats)
+
+    cleaned = clean_listings(raw)
+    del raw
+    listings, timings["remove_outliers"] = _best_of(lambda: remove_outliers(cleaned), repeats)
+    del cleaned
+
+    frame = listings.assign(availability=normalize_availability(listings["availability"]))
+    frame = frame.drop(columns=["price_per_sqft"])
+    (X, y, _), timings["one_hot"] = _best_of(lambda: encode_features(frame), repeats)
+    params = {name: values[0] for name, values in CANDIDATES["Linear Regression"][1].items()}
+    _, timings["fit_linear"] = _best_of(lambda: LinearRegression(**params).fit(X, y), repeats)
+    del X, y, frame
+
+    inputs = listings[INPUT_COLUMNS]
+    _, timings["predict_batch"] = _best_of(lambda: predictor.predict_batch(inputs), repeats)
+    return timings
+
+
+def environment():
+    import sklearn
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, check=True,
+                                capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(sizes, repeats, app=True):
+    """{"environment": ..., "results": {"<benchmark>[@rows]": {"seconds", "rows"}}}"""
+    import warnings
+
+    from predictor import PricePredictor
+
+    # The shipped pickle was written by an older scikit-learn
+    warnings.filterwarnings("ignore", message="Trying to unpickle")
+    os.chdir(REPO_DIR)
+    predictor = PricePredictor.from_files()
+    results = {}
+
+    def record(name, seconds, rows=None):
+        key = name if rows is None else f"{name}@{rows}"
+        results[key] = {"seconds": seconds, "rows": rows}
+        per_row = f"  ({seconds / rows * 1e9:,.0f} ns/row)" if rows else ""
+        print(f"{key:<28} {seconds:>12.6f} s{per_row}", flush=True)
+
+    record("predict_price", bench_predict_price(predictor, repeats), SINGLE_PREDICTIONS)
+    if app:
+        record("app_cold_start", bench_app_cold_start(repeats))
+        record("app_first_predict", bench_app_first_predict(repeats))
+    for n_rows in sizes:
+        for name, seconds in bench_size(n_rows, predictor, repeats).items():
+            record(name, seconds, n_rows)
+    return {"environment": environment(), "results": results}
+
+
+def compare(results, baseline, threshold=0.25, noise_floor=0.001):
+    """Per-benchmark comparison table against a baseline run."""
+    rows = []
+    for key, current in results["results"].items():
+        base = baseline["results"].get(key)
+        seconds = current["seconds"]
+        if base is None:
+            rows.append({"benchmark": key, "baseline_s": np.nan, "current_s": seconds,
+                         "ratio": np.nan, "status": "new"})
+            continue
+        ratio = seconds / base["seconds"] if base["seconds"] else np.inf
+        if max(seconds, base["seconds"]) < noise_floor:
+            status = "ok"
+        elif ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({"benchmark": key, "baseline_s": base["seconds"], "current_s": seconds,
+                     "ratio": ratio, "status": status})
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare against a baseline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=3, help="runs per benchmark; the fastest is kept")
+    parser.add_argument("--no-app", dest="app", action="store_false", help="skip the app cold-start benchmark")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="also store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="flag benchmarks slower than baseline by more than this fraction")
+    parser.add_argument("--noise-floor", type=float, default=0.001,
+                        help="never flag timings shorter than this many seconds")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeats, args.app)
+    with open(os.path.join(REPO_DIR, args.output), "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults → {args.output}")
+
+    baseline_path = os.path.join(REPO_DIR, args.baseline)
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline → {args.baseline}")
+        return
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    report = compare(results, baseline, args.threshold, args.noise_floor)
+    print(f"\nAgainst baseline from {baseline['environment'].get('commit')} "
+          f"({baseline['environment'].get('timestamp')}), threshold +{args.threshold:.0%}:")
+    print(report.to_string(index=False, float_format="%.4f"))
+    regressions = report[report["status"] == "REGRESSION"]
+    if len(regressions):
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions['benchmark'])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Synthetic raw listings shaped like bengaluru_house_prices.csv, at any size.
+
+Columns, value formats and rough proportions follow the real file:
+area types, "Ready To Move" vs. "18-Dec"-style availability, "2 BHK" /
+"4 Bedroom" / "1 RK" sizes, total_sqft as plain numbers, "1100 - 1450"
+ranges and unit strings ("34.46Sq. Meter", "1.25Acres"), missing bath and
+balcony values, a long tail of rare locations with stray whitespace, and
+prices driven by per-location price per sqft. Text columns come back as
+categoricals, like dataset_cache.load_dataset returns them, so millions of
+rows fit in memory.
+
+Example:
+    python -m benchmarks.synthetic 1000000 synthetic_listings.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+AREA_TYPES = {"Super built-up  Area": 0.66, "Built-up  Area": 0.182, "Plot  Area": 0.151, "Carpet  Area": 0.007}
+BHK_PROBABILITIES = {1: 0.05, 2: 0.42, 3: 0.37, 4: 0.11, 5: 0.025, 6: 0.015, 7: 0.006, 8: 0.004}
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+N_LOCATIONS = 1300
+# Share of rows with a range / unit total_sqft, and with missing values
+RANGE_SHARE = 0.015
+UNIT_SHARE = 0.0035
+MISSING = {"location": 0.0001, "size": 0.0012, "bath": 0.0055, "balcony": 0.046, "society": 0.41}
+# (unit, square feet per unit, decimals) as written in the raw file
+UNITS = [("Sq. Meter", 10.7639, 2), ("Sq. Yards", 9.0, 1), ("Acres", 43560, 2), ("Cents", 435.6, 1)]
+
+
+def _categorical(codes, categories, rng, missing=0.0):
+    codes = np.asarray(codes, dtype=np.int64)
+    if missing:
+        codes = np.where(rng.random(len(codes)) < missing, -1, codes)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(categories))
+
+
+def _total_sqft(sqft, rng):
+    """Mostly integer strings; a small share of ranges and unit strings."""
+    low, high = int(sqft.min()), int(sqft.max())
+    numbers = [str(v) for v in range(low, high + 1)]
+    codes = sqft.astype(np.int64) - low
+    kind = rng.random(len(sqft))
+    special_rows = np.flatnonzero(kind < RANGE_SHARE + UNIT_SHARE)
+    special = []
+    for row in special_rows:
+        if kind[row] < RANGE_SHARE:
+            width = int(rng.integers(10, 600))
+            special.append(f"{int(sqft[row]) - width // 2} - {int(sqft[row]) + width - width // 2}")
+        else:
+            unit, factor, decimals = UNITS[int(rng.integers(len(UNITS)))]
+            special.append(f"{sqft[row] / factor:.{decimals}f}{unit}")
+    # Ranges and unit strings never spell a plain number, so they extend the categories
+    special_codes, special_values = pd.factorize(pd.Series(special, dtype=object))
+    codes[special_rows] = len(numbers) + special_codes
+    return codes, numbers + list(special_values)
+
+
+def synthetic_raw(n_rows, n_locations=N_LOCATIONS, seed=0):
+    rng = np.random.default_rng(seed)
+
+    area_type = rng.choice(len(AREA_TYPES), n_rows, p=list(AREA_TYPES.values()))
+    availability_values = ["Ready To Move"] + [f"{y}-{m}" for y in range(17, 23) for m in MONTHS]
+    future = rng.random(n_rows) >= 0.8
+    availability = np.where(future, rng.integers(1, len(availability_values), n_rows), 0)
+
+    # Power-law popularity (at 13k rows ~250 locations have 10+ listings, as in
+    # the real file); one in a hundred rows spells its location with stray spaces
+    popularity = (np.arange(n_locations) + 20.0) ** -1.3
+    location = rng.choice(n_locations, n_rows, p=popularity / popularity.sum())
+    names = [f"Location {i}" for i in range(n_locations)]
+    location = np.where(rng.random(n_rows) < 0.01, location + n_locations, location)
+    location_names = names + [f" Location {i}" for i in range(n_locations)]
+
+    bhk_values = np.array(list(BHK_PROBABILITIES))
+    bhk = rng.choice(bhk_values, n_rows, p=list(BHK_PROBABILITIES.values()))
+    size_kind = rng.choice(3, n_rows, p=[0.8, 0.19, 0.01])  # BHK, Bedroom, RK
+    size_kind = np.where((size_kind == 2) & (bhk != 1), 0, size_kind)
+    size_names = [f"{b} {label}" for label in ("BHK", "Bedroom", "RK") for b in bhk_values]
+    size = size_kind * len(bhk_values) + (bhk - bhk_values[0])
+
+    sqft = np.round(bhk * rng.normal(560, 150, n_rows).clip(250, None))
+    sqft_codes, sqft_categories = _total_sqft(sqft, rng)
+
+    bath = (bhk + rng.choice([-1, 0, 0, 0, 1, 2], n_rows)).clip(1, None).astype(np.float32)
+    bath[rng.random(n_rows) < MISSING["bath"]] = np.nan
+    balcony = rng.choice(4, n_rows, p=[0.08, 0.37, 0.42, 0.13]).astype(np.float32)
+    balcony[rng.random(n_rows) < MISSING["balcony"]] = np.nan
+
+    location_pps = rng.lognormal(np.log(6000), 0.45, n_locations)
+    pps = location_pps[location % n_locations] * rng.lognormal(0, 0.3, n_rows)
+    price = np.round(sqft * pps / 100000, 2)
+
+    n_societies = max(1, n_rows // 5)
+    return pd.DataFrame({
+        "area_type": _categorical(area_type, list(AREA_TYPES), rng),
+        "availability": _categorical(availability, availability_values, rng),
+        "location": _categorical(location, location_names, rng, MISSING["location"]),
+        "size": _categorical(size, size_names, rng, MISSING["size"]),
+        "society": _categorical(rng.integers(0, n_societies, n_rows),
+                                [f"Soc{i:07d}" for i in range(n_societies)], rng, MISSING["society"]),
+        "total_sqft": _categorical(sqft_codes, sqft_categories, rng),
+        "bath": bath,
+        "balcony": balcony,
+        "price": price,
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic raw listings shaped like bengaluru_house_prices.csv.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("output", help="output .csv path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    synthetic_raw(args.rows, seed=args.seed).to_csv(args.output, index=False)
+    print(f"Wrote {args.rows:,} rows → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
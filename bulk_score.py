@@ -0,0 +1,185 @@
+"""Score large listing files (CSV or Parquet) in bounded-memory chunks.
+
+Free-text locations are resolved onto the trained ones first (see
+locations.py); the output records the match and its confidence next to the
+predicted price.
+
+Example:
+    python bulk_score.py listings.csv scored.parquet --workers 8 --chunksize 200000
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from predictor import FEATURE_NAMES_PATH, MODEL_PATH, PricePredictor
+from preprocessing import extract_bhk, parse_total_sqft
+
+PREDICTION_COLUMN = "predicted_price"
+LOCATION_MATCH_COLUMN = "matched_location"
+LOCATION_CONFIDENCE_COLUMN = "location_confidence"
+# CSV columns read as numbers (unparseable values become NaN); every other
+# CSV column is kept as text, so each chunk has the same types whatever its values
+NUMERIC_CSV_COLUMNS = ["bath", "balcony", "bhk", "price"]
+
+_worker_predictor = None
+
+
+def prepare_listings(chunk):
+    """Derive the predictor's raw inputs from a listings chunk shaped like
+    bengaluru_house_prices.csv, parsing size and total_sqft the same way as
+    the training pipeline."""
+    out = pd.DataFrame(index=chunk.index)
+    if "bhk" in chunk.columns:
+        out["bhk"] = pd.to_numeric(chunk["bhk"], errors="coerce")
+    else:
+        out["bhk"] = extract_bhk(chunk["size"])
+    out["total_sqft"] = parse_total_sqft(chunk["total_sqft"])
+    out["bath"] = pd.to_numeric(chunk["bath"], errors="coerce")
+    out["balcony"] = pd.to_numeric(chunk["balcony"], errors="coerce").fillna(0)
+    out["location"] = chunk["location"].astype("string").str.strip()
+    out["area_type"] = chunk["area_type"].astype("string")
+    return out
+
+
+def score_chunk(chunk, predictor):
+    inputs = prepare_listings(chunk)
+    # Spelling variants are priced as the trained location they match, not as unknown
+    inputs["location"], confidence = predictor.location_resolver.resolve(inputs["location"])
+    valid = inputs[["total_sqft", "bath", "bhk"]].notna().all(axis=1).to_numpy()
+    prices = np.full(len(chunk), np.nan)
+    if valid.any():
+        prices[valid] = predictor.predict_batch(inputs[valid])
+    result = chunk.copy()
+    result[PREDICTION_COLUMN] = prices
+    result[LOCATION_MATCH_COLUMN] = inputs["location"].to_numpy()
+    result[LOCATION_CONFIDENCE_COLUMN] = confidence
+    return result
+
+
+def _init_worker(model_path, feature_names_path):
+    global _worker_predictor
+    _worker_predictor = PricePredictor.from_files(model_path, feature_names_path)
+
+
+def _score_in_worker(chunk):
+    return score_chunk(chunk, _worker_predictor)
+
+
+def read_chunks(path, chunksize):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        names = pd.read_csv(path, nrows=0).columns
+        for chunk in pd.read_csv(path, chunksize=chunksize, dtype={name: str for name in names}):
+            for name in chunk.columns.intersection(NUMERIC_CSV_COLUMNS):
+                chunk[name] = pd.to_numeric(chunk[name], errors="coerce")
+            yield chunk
+
+
+def output_schema(input_path):
+    """Arrow schema of the scored output: the input columns plus the three added by score_chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if input_path.endswith(".parquet"):
+        fields = list(pq.ParquetFile(input_path).schema_arrow)
+    else:
+        fields = [pa.field(name, pa.float64() if name in NUMERIC_CSV_COLUMNS else pa.string())
+                  for name in pd.read_csv(input_path, nrows=0).columns]
+    return pa.schema(fields + [pa.field(PREDICTION_COLUMN, pa.float64()),
+                               pa.field(LOCATION_MATCH_COLUMN, pa.string()),
+                               pa.field(LOCATION_CONFIDENCE_COLUMN, pa.float64())])
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file as they arrive.
+
+    Parquet output is written with ``schema`` (see output_schema), not one
+    inferred from the first chunk, where an all-missing column has no type.
+    """
+
+    def __init__(self, path, schema=None):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self.schema = schema
+        self._writer = None
+        self._first = True
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def bulk_score(input_path, output_path, chunksize=100_000, workers=None,
+               model_path=MODEL_PATH, feature_names_path=FEATURE_NAMES_PATH):
+    """Score input_path into output_path and return (rows, seconds).
+
+    At most 2 * workers chunks are in flight at once, so memory is bounded by
+    the chunk size rather than the file size. Output keeps input row order.
+    """
+    workers = workers or os.cpu_count() or 1
+    writer = ChunkWriter(output_path, output_schema(input_path) if output_path.endswith(".parquet") else None)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        if workers == 1:
+            predictor = PricePredictor.from_files(model_path, feature_names_path)
+            for chunk in read_chunks(input_path, chunksize):
+                writer.write(score_chunk(chunk, predictor))
+                rows += len(chunk)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(model_path, feature_names_path)) as pool:
+                pending = deque()
+                for chunk in read_chunks(input_path, chunksize):
+                    pending.append(pool.submit(_score_in_worker, chunk))
+                    if len(pending) >= 2 * workers:
+                        scored = pending.popleft().result()
+                        writer.write(scored)
+                        rows += len(scored)
+                while pending:
+                    scored = pending.popleft().result()
+                    writer.write(scored)
+                    rows += len(scored)
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-score a listings file with the trained model.")
+    parser.add_argument("input", help="input .csv or .parquet listings file")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--features", default=FEATURE_NAMES_PATH)
+    args = parser.parse_args(argv)
+
+    rows, seconds = bulk_score(args.input, args.output, args.chunksize, args.workers,
+                               args.model, args.features)
+    rate = rows / seconds if seconds else float("inf")
+    print(f"Scored {rows:,} rows in {seconds:.2f}s ({rate:,.0f} rows/sec) → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Comparable-listings (comps) index over the cleaned dataset.
+
+Listings from after_outlier_removal.csv are sorted by location into one
+contiguous block per location, over features normalised by their standard
+deviation (total_sqft, bhk, bath) plus a one-hot area_type block scaled by
+AREA_TYPE_WEIGHT, so a listing of a different area type ranks behind every
+close match of the same type. A query touches only its location's block:
+small blocks are scanned with numpy, blocks of KD_TREE_MIN_ROWS or more get
+a scipy cKDTree.
+
+    index = ComparablesIndex.from_csv()
+    index.query("Whitefield", total_sqft=1200, bhk=2, bath=2, area_type="Super built-up  Area", k=5)
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import load_dataset
+from preprocessing import AFTER_OUTLIERS_PATH
+
+FEATURE_COLUMNS = ["total_sqft", "bhk", "bath"]
+LISTING_COLUMNS = ["location", "area_type", "total_sqft", "bhk", "bath", "balcony", "price", "price_per_sqft"]
+# Distance added (sqrt(2) * weight) when the area type differs
+AREA_TYPE_WEIGHT = 10.0
+KD_TREE_MIN_ROWS = 256
+DEFAULT_K = 5
+
+
+class ComparablesIndex:
+    """Top-k nearest actual listings within a location."""
+
+    def __init__(self, listings):
+        listings = listings[LISTING_COLUMNS].dropna(subset=FEATURE_COLUMNS + ["location", "area_type"])
+        location = listings["location"].astype(str).to_numpy()
+        order = np.argsort(location, kind="stable")
+        self.listings = listings.iloc[order].reset_index(drop=True)
+        location = location[order]
+        # Plain column arrays: slicing these is much cheaper than DataFrame.iloc per query
+        self.columns = {c: self.listings[c].to_numpy(dtype=object if c in ("location", "area_type") else None)
+                        for c in LISTING_COLUMNS}
+
+        # One contiguous block per location: rows [start, stop)
+        self.locations, starts = np.unique(location, return_index=True)
+        stops = np.append(starts[1:], len(location))
+        self.blocks = {name: (int(a), int(b)) for name, a, b in zip(self.locations, starts, stops)}
+
+        numeric = self.listings[FEATURE_COLUMNS].to_numpy(dtype=float)
+        self.scale = numeric.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        self.area_types = sorted(self.listings["area_type"].astype(str).unique())
+        self.area_type_index = {name: i for i, name in enumerate(self.area_types)}
+        area_codes = self.listings["area_type"].astype(str).map(self.area_type_index).to_numpy()
+        self.points = np.hstack([numeric / self.scale,
+                                 np.eye(len(self.area_types))[area_codes] * AREA_TYPE_WEIGHT])
+
+        self.trees = {}
+        if any(b - a >= KD_TREE_MIN_ROWS for a, b in self.blocks.values()):
+            from scipy.spatial import cKDTree
+
+            self.trees = {name: cKDTree(self.points[a:b])
+                          for name, (a, b) in self.blocks.items() if b - a >= KD_TREE_MIN_ROWS}
+
+    @classmethod
+    def from_csv(cls, path=AFTER_OUTLIERS_PATH):
+        return cls(load_dataset(path, columns=LISTING_COLUMNS))
+
+    def __len__(self):
+        return len(self.listings)
+
+    def _point(self, total_sqft, bhk, bath, area_type):
+        point = np.zeros(self.points.shape[1])
+        point[:len(FEATURE_COLUMNS)] = np.array([total_sqft, bhk, bath], dtype=float) / self.scale
+        code = self.area_type_index.get(area_type)
+        if code is not None:
+            point[len(FEATURE_COLUMNS) + code] = AREA_TYPE_WEIGHT
+        return point
+
+    def query_positions(self, location, total_sqft, bhk, bath, area_type, k=DEFAULT_K):
+        """Row positions in ``self.listings`` and distances, nearest first.
+
+        Empty when the location has no listings.
+        """
+        block = self.blocks.get(location)
+        if block is None or k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        start, stop = block
+        point = self._point(total_sqft, bhk, bath, area_type)
+        k = min(k, stop - start)
+        tree = self.trees.get(location)
+        if tree is not None:
+            distances, positions = tree.query(point, k=k)
+            return np.atleast_1d(positions) + start, np.atleast_1d(distances)
+        diff = self.points[start:stop] - point
+        squared = np.einsum("ij,ij->i", diff, diff)
+        nearest = np.argpartition(squared, k - 1)[:k] if k < len(squared) else np.arange(len(squared))
+        nearest = nearest[np.argsort(squared[nearest], kind="stable")]
+        return nearest + start, np.sqrt(squared[nearest])
+
+    def query(self, location, total_sqft, bhk, bath, area_type, k=DEFAULT_K):
+        """The k most similar listings in ``location`` as a DataFrame with a distance column."""
+        positions, distances = self.query_positions(location, total_sqft, bhk, bath, area_type, k)
+        return pd.DataFrame({**{c: values[positions] for c, values in self.columns.items()},
+                             "distance": distances})
+
+    def query_records(self, location, total_sqft, bhk, bath, area_type, k=DEFAULT_K):
+        """Same as query(), as a list of JSON-serialisable dicts."""
+        positions, distances = self.query_positions(location, total_sqft, bhk, bath, area_type, k)
+        columns = {c: values[positions].tolist() for c, values in self.columns.items()}
+        columns["distance"] = distances.tolist()
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def bench(path=AFTER_OUTLIERS_PATH, queries=10_000, k=DEFAULT_K, seed=0):
+    start = time.perf_counter()
+    index = ComparablesIndex.from_csv(path)
+    build_s = time.perf_counter() - start
+    rng = np.random.default_rng(seed)
+    sample = index.listings.iloc[rng.integers(0, len(index), queries)]
+    args = list(zip(sample["location"].astype(str), sample["total_sqft"], sample["bhk"], sample["bath"],
+                    sample["area_type"].astype(str)))
+
+    start = time.perf_counter()
+    for location, sqft, bhk, bath, area_type in args:
+        index.query_positions(location, sqft, bhk, bath, area_type, k)
+    index_us = (time.perf_counter() - start) / queries * 1e6
+
+    start = time.perf_counter()
+    for location, sqft, bhk, bath, area_type in args:
+        index.query_records(location, sqft, bhk, bath, area_type, k)
+    records_us = (time.perf_counter() - start) / queries * 1e6
+
+    start = time.perf_counter()
+    for location, sqft, bhk, bath, area_type in args[:1000]:
+        index.query(location, sqft, bhk, bath, area_type, k)
+    frame_us = (time.perf_counter() - start) / min(queries, 1000) * 1e6
+
+    # What a per-request pandas filter costs, for comparison
+    listings = index.listings
+    start = time.perf_counter()
+    for location, sqft, bhk, bath, area_type in args[:200]:
+        same = listings[listings["location"] == location]
+        score = ((same["total_sqft"] - sqft) / index.scale[0]) ** 2 + ((same["bhk"] - bhk) / index.scale[1]) ** 2
+        same.loc[score.nsmallest(k).index]
+    pandas_us = (time.perf_counter() - start) / min(queries, 200) * 1e6
+
+    print(f"{len(index):,} listings in {len(index.blocks)} locations "
+          f"({len(index.trees)} KD-trees), built in {build_s * 1000:.1f} ms")
+    print(f"top-{k} µs/query: {index_us:.1f} positions, {records_us:.1f} records, "
+          f"{frame_us:.1f} DataFrame; pandas filter {pandas_us:.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark comparable-listings lookups.")
+    parser.add_argument("--data", default=AFTER_OUTLIERS_PATH)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("-k", type=int, default=DEFAULT_K)
+    args = parser.parse_args(argv)
+    bench(args.data, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Typed, columnar cache for the project's CSV datasets.
+
+The first load of a CSV converts it to an uncompressed Arrow IPC (Feather v2)
+file under .dataset_cache/ with explicit dtypes: categoricals (with sorted
+categories) for the string columns and compact numeric types. Later loads
+memory-map that file and materialise only the requested columns. The cache
+is rebuilt automatically when the source CSV changes (size or mtime).
+
+    from dataset_cache import load_dataset
+    df = load_dataset("after_outlier_removal.csv", columns=["location", "price_per_sqft"])
+
+    python dataset_cache.py bench after_outlier_removal.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+DATASET_CACHE_DIR = ".dataset_cache"
+CACHE_FORMAT_VERSION = 1
+
+_CLEANED_SCHEMA = {
+    "area_type": "category",
+    "availability": "category",
+    "location": "category",
+    "total_sqft": "float64",
+    "bath": "float32",
+    "balcony": "float32",
+    "price": "float64",
+    "bhk": "int16",
+    "price_per_sqft": "float64",
+}
+
+# Explicit dtypes for the files produced and consumed by this project
+SCHEMAS = {
+    "bengaluru_house_prices.csv": {
+        "area_type": "category",
+        "availability": "category",
+        "location": "category",
+        "size": "category",
+        "society": "category",
+        "total_sqft": "category",  # raw text: numbers, ranges and units
+        "bath": "float32",
+        "balcony": "float32",
+        "price": "float64",
+    },
+    "cleaned_bengaluru_house_prices.csv": _CLEANED_SCHEMA,
+    "before_outlier_removal.csv": _CLEANED_SCHEMA,
+    "after_outlier_removal.csv": _CLEANED_SCHEMA,
+}
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "version": CACHE_FORMAT_VERSION}
+
+
+def cache_path_for(path, cache_dir=DATASET_CACHE_DIR):
+    # Keyed on the absolute path too, so same-named CSVs in different directories don't collide
+    name = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=8).hexdigest()
+    return os.path.join(cache_dir, f"{name}-{digest}.arrow")
+
+
+def _apply_schema(df, schema):
+    for column in df.columns:
+        dtype = schema.get(column)
+        if dtype is None:
+            if df[column].dtype == object or pd.api.types.is_string_dtype(df[column]):
+                dtype = "category"
+            elif pd.api.types.is_integer_dtype(df[column]):
+                df[column] = pd.to_numeric(df[column], downcast="integer")
+                continue
+            else:
+                continue
+        if dtype == "category":
+            values = df[column].astype("category")
+            df[column] = values.cat.set_categories(sorted(values.cat.categories))
+        else:
+            try:
+                df[column] = df[column].astype(dtype)
+            except (TypeError, ValueError):
+                # e.g. missing values in an integer column: keep the inferred dtype
+                pass
+    return df
+
+
+def convert_dataset(path, cache_dir=DATASET_CACHE_DIR):
+    """Convert a CSV to the typed Arrow cache and return the cache file path."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    schema = SCHEMAS.get(os.path.basename(path), {})
+    df = pd.read_csv(path, dtype={c: t for c, t in schema.items() if t == "category"})
+    df = _apply_schema(df, schema)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"source_signature"] = json.dumps(_source_signature(path)).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    target = cache_path_for(path, cache_dir)
+    # A private temp file per writer, so processes warming the cache at once don't clobber each other
+    handle, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(target)}.", dir=cache_dir)
+    os.close(handle)
+    try:
+        # Uncompressed so the file can be memory-mapped and read zero-copy
+        feather.write_feather(table, tmp, compression="uncompressed")
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return target
+
+
+def _cache_is_fresh(path, target):
+    import pyarrow.feather as feather
+
+    if not os.path.exists(target):
+        return False
+    try:
+        metadata = feather.read_table(target, columns=[], memory_map=True).schema.metadata or {}
+    except Exception:
+        return False
+    stored = metadata.get(b"source_signature")
+    return stored is not None and json.loads(stored) == _source_signature(path)
+
+
+def load_dataset(path, columns=None, cache_dir=DATASET_CACHE_DIR):
+    """Load a project CSV through the typed Arrow cache, building it if needed.
+
+    Falls back to a typed pd.read_csv when pyarrow is not installed.
+    """
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        schema = SCHEMAS.get(os.path.basename(path), {})
+        df = pd.read_csv(path, usecols=columns)
+        return _apply_schema(df, schema)
+
+    target = cache_path_for(path, cache_dir)
+    if not _cache_is_fresh(path, target):
+        convert_dataset(path, cache_dir)
+    table = feather.read_table(target, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def _frame_nbytes(df):
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def bench(path, columns=None, repeats=5, cache_dir=DATASET_CACHE_DIR):
+    def timed(load):
+        load()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            df = load()
+        return (time.perf_counter() - start) / repeats, df
+
+    csv_s, csv_df = timed(lambda: pd.read_csv(path, usecols=columns))
+    cached_s, cached_df = timed(lambda: load_dataset(path, columns, cache_dir))
+    print(f"{'':>10} {'load ms':>10} {'memory MB':>10}")
+    print(f"{'csv':>10} {csv_s * 1000:10.2f} {_frame_nbytes(csv_df) / 1e6:10.2f}")
+    print(f"{'arrow':>10} {cached_s * 1000:10.2f} {_frame_nbytes(cached_df) / 1e6:10.2f}")
+    print(f"speedup {csv_s / cached_s:.1f}x, memory {_frame_nbytes(csv_df) / _frame_nbytes(cached_df):.1f}x smaller")
+    print(cached_df.dtypes.to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or benchmark the typed dataset cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    conv = sub.add_parser("convert", help="convert CSVs to the Arrow cache")
+    conv.add_argument("paths", nargs="+")
+    ben = sub.add_parser("bench", help="compare pd.read_csv with the cached load")
+    ben.add_argument("path")
+    ben.add_argument("--columns", nargs="+", default=None)
+    ben.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--cache-dir", default=DATASET_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        for path in args.paths:
+            print(f"{path} → {convert_dataset(path, args.cache_dir)}")
+    else:
+        bench(args.path, args.columns, args.repeats, args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()
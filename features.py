@@ -0,0 +1,81 @@
+"""One-hot feature encoding shared by training (train.py) and serving (predictor.py).
+
+Reproduces the column layout of ``pd.get_dummies(X, drop_first=True)`` used
+by the notebook - numeric columns first, then one block per categorical
+column with sorted categories and the first category dropped - but builds a
+scipy CSR matrix directly, so a row costs its handful of non-zeros instead
+of one float per known location.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+NUMERIC_COLUMNS = ["total_sqft", "bath", "balcony", "bhk"]
+CATEGORICAL_COLUMNS = ["location", "availability", "area_type"]
+
+
+def normalize_availability(availability):
+    """Collapse availability dates to "Ready To Move" / "Future Possession"."""
+    ready = availability.astype(str).str.strip().str.lower() == "ready to move"
+    return pd.Series(np.where(ready, "Ready To Move", "Future Possession"), index=availability.index)
+
+
+class FeatureEncoder:
+    """Maps raw listing columns onto a fixed list of feature names."""
+
+    def __init__(self, feature_names):
+        self.feature_names = list(feature_names)
+        self.column_index = {name: i for i, name in enumerate(self.feature_names)}
+        self.numeric_columns = [c for c in NUMERIC_COLUMNS if c in self.column_index]
+        self.categorical_columns = [
+            c for c in CATEGORICAL_COLUMNS
+            if any(name.startswith(f"{c}_") for name in self.feature_names)]
+
+    @classmethod
+    def fit(cls, df):
+        """Derive feature names from training data, like get_dummies(drop_first=True)."""
+        names = [c for c in NUMERIC_COLUMNS if c in df.columns]
+        for column in CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                categories = sorted(df[column].dropna().unique())
+                names += [f"{column}_{value}" for value in categories[1:]]
+        return cls(names)
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def category_indices(self, column, values):
+        """Feature column for each raw category value, -1 where unseen/dropped."""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        lookup = np.array([self.column_index.get(f"{column}_{u}", -1) for u in uniques] + [-1],
+                          dtype=np.intp)
+        return lookup[codes]
+
+    def transform(self, df):
+        """CSR matrix (n_rows x n_features). Categorical columns missing from
+        ``df`` are left all-zero, i.e. encoded as their dropped category."""
+        n = len(df)
+        rows, cols, data = [], [], []
+        row_ids = np.arange(n)
+        for column in self.numeric_columns:
+            values = df[column].to_numpy(dtype=float)
+            nonzero = values != 0
+            rows.append(row_ids[nonzero])
+            cols.append(np.full(nonzero.sum(), self.column_index[column]))
+            data.append(values[nonzero])
+        for column in self.categorical_columns:
+            if column not in df.columns:
+                continue
+            idx = self.category_indices(column, df[column].to_numpy())
+            known = idx >= 0
+            rows.append(row_ids[known])
+            cols.append(idx[known])
+            data.append(np.ones(known.sum()))
+        matrix = sp.coo_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n, self.n_features))
+        return matrix.tocsr()
+
+    def transform_dense(self, df):
+        return self.transform(df).toarray()
@@ -0,0 +1,360 @@
+"""Incremental LinearRegression updates from batches of new raw listings.
+
+Instead of rerunning cleaning, outlier removal and every model fit over the
+full history, a state file (model_state.npz) keeps running sufficient
+statistics:
+
+* per-location price_per_sqft count / mean / M2 for each pass of the
+  price-per-sqft outlier filter, and per-(location, bhk) count / sum for the
+  BHK filter, so a new batch is filtered against history + batch exactly as
+  preprocessing.remove_outliers would filter it;
+* n, feature means, target mean and the centred scatter matrices
+  (XᵀX, Xᵀy, yᵀy after centring), merged batch by batch with Chan's
+  parallel update, from which the coefficients are re-solved.
+
+An update therefore costs O(batch rows + n_features²), independent of how
+many rows were folded in before. Decisions already made about earlier rows
+are kept: a listing dropped as an outlier is not revisited when the
+location statistics later move.
+
+New locations are held back as "Other" until their running count reaches
+RARE_LOCATION_THRESHOLD (the notebook's rule for a location of its own); at
+that point a ``location_<name>`` column is appended to feature_names with
+zero statistics for all earlier rows.
+
+    python incremental.py init                         # state from bengaluru_house_prices.csv
+    python incremental.py update new_listings.csv      # fold in a batch, rewrite best_model.pkl
+"""
+import argparse
+import json
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from dataset_cache import load_dataset
+from features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, FeatureEncoder, normalize_availability
+from model_artifact import ARTIFACT_PATH, export_artifact
+from predictor import FEATURE_NAMES_PATH, MODEL_PATH
+from preprocessing import (
+    MIN_SQFT_PER_BHK, PPS_FILTER_PASSES, RARE_LOCATION_THRESHOLD, RAW_DATA_PATH,
+    _bhk_as_int, clean_listings, group_rare_locations, remove_bhk_outliers, remove_pps_outliers)
+
+STATE_PATH = "model_state.npz"
+STATE_VERSION = 1
+TARGET = "price"
+# Rows densified at a time when accumulating the scatter matrices
+CHUNK_ROWS = 50_000
+
+_MOMENT_COLUMNS = ["count", "mean", "m2"]
+
+
+def _moments(values, keys):
+    """Per-key count / mean / M2 (sum of squared deviations)."""
+    grouped = values.groupby(keys, sort=False, observed=True)
+    stats = grouped.agg(["count", "mean"])
+    stats["m2"] = grouped.var(ddof=0) * stats["count"]
+    return stats
+
+
+def _merge_moments(a, b):
+    """Chan et al. parallel merge of two count / mean / M2 tables."""
+    index = a.index.union(b.index)
+    a = a.reindex(index, fill_value=0.0)
+    b = b.reindex(index, fill_value=0.0)
+    count = a["count"] + b["count"]
+    delta = b["mean"] - a["mean"]
+    share = (b["count"] / count).fillna(0.0)
+    return pd.DataFrame({
+        "count": count,
+        "mean": a["mean"] + delta * share,
+        "m2": a["m2"] + b["m2"] + delta ** 2 * a["count"] * share,
+    })
+
+
+class RegressionStats:
+    """Running mean / centred scatter of [X, y] for ordinary least squares."""
+
+    def __init__(self, n_features):
+        self.n = 0
+        self.mean_x = np.zeros(n_features)
+        self.mean_y = 0.0
+        self.sxx = np.zeros((n_features, n_features))
+        self.sxy = np.zeros(n_features)
+        self.syy = 0.0
+
+    @property
+    def n_features(self):
+        return len(self.mean_x)
+
+    def grow(self, n_new):
+        """Append all-zero features (columns earlier rows never had set)."""
+        self.mean_x = np.append(self.mean_x, np.zeros(n_new))
+        self.sxy = np.append(self.sxy, np.zeros(n_new))
+        self.sxx = np.pad(self.sxx, ((0, n_new), (0, n_new)))
+
+    def update(self, X, y):
+        for start in range(0, X.shape[0], CHUNK_ROWS):
+            self._merge(X[start:start + CHUNK_ROWS].toarray(), y[start:start + CHUNK_ROWS])
+
+    def _merge(self, X, y):
+        nb = len(y)
+        if nb == 0:
+            return
+        mean_x, mean_y = X.mean(axis=0), y.mean()
+        Xc, yc = X - mean_x, y - mean_y
+        n = self.n + nb
+        dx, dy = mean_x - self.mean_x, mean_y - self.mean_y
+        weight = self.n * nb / n
+        self.sxx += Xc.T @ Xc + np.outer(dx, dx) * weight
+        self.sxy += Xc.T @ yc + dx * dy * weight
+        self.syy += yc @ yc + dy * dy * weight
+        self.mean_x += dx * nb / n
+        self.mean_y += dy * nb / n
+        self.n = n
+
+    def solve(self):
+        """Least-squares fit with intercept: (coef, intercept, rank, singular values, RMSE)."""
+        # Jacobi scaling: total_sqft and the one-hot columns differ by ~10⁶ in variance
+        diag = np.diag(self.sxx)
+        scale = np.where(diag > 0, 1.0 / np.sqrt(np.where(diag > 0, diag, 1.0)), 1.0)
+        scaled = self.sxx * np.outer(scale, scale)
+        z, _, rank, singular = np.linalg.lstsq(scaled, self.sxy * scale, rcond=None)
+        coef = z * scale
+        intercept = self.mean_y - self.mean_x @ coef
+        sse = max(self.syy - 2 * coef @ self.sxy + coef @ self.sxx @ coef, 0.0)
+        return coef, intercept, rank, singular, np.sqrt(sse / max(self.n, 1))
+
+
+class IncrementalModel:
+    """Feature layout, outlier-filter statistics and regression statistics."""
+
+    def __init__(self, feature_names, categories, pending, pps_stats, bhk_stats, regression):
+        self.encoder = FeatureEncoder(feature_names)
+        # Every known value per categorical column, including the dropped baseline
+        self.categories = {column: list(values) for column, values in categories.items()}
+        # Unseen locations -> cleaned rows seen so far, until promoted
+        self.pending = dict(pending)
+        self.pps_stats = pps_stats
+        self.bhk_stats = bhk_stats
+        self.regression = regression
+
+    @property
+    def feature_names(self):
+        return self.encoder.feature_names
+
+    # ------------------------------------------------------------------
+    # Building from the full history
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_raw(cls, raw, pps_passes=PPS_FILTER_PASSES):
+        """Run the preprocessing pipeline once, recording its statistics."""
+        if isinstance(raw, (str, os.PathLike)):
+            raw = load_dataset(raw)
+        cleaned = _bhk_as_int(clean_listings(raw, rare_location_threshold=0))
+        counts = cleaned["location"].value_counts()
+        pending = counts[counts < RARE_LOCATION_THRESHOLD]
+        cleaned["location"] = group_rare_locations(cleaned["location"])
+
+        # Same steps as preprocessing.remove_outliers, keeping each pass's input stats
+        df = cleaned[cleaned.total_sqft / cleaned.bhk >= MIN_SQFT_PER_BHK]
+        pps_stats = []
+        for _ in range(pps_passes):
+            pps_stats.append(_moments(df["price_per_sqft"], df["location"].astype(str)))
+            df = remove_pps_outliers(df)
+        bhk_stats = _moments(df["price_per_sqft"], [df["location"].astype(str), df["bhk"]])
+        df = remove_bhk_outliers(df)
+
+        frame = _training_frame(df)
+        encoder = FeatureEncoder.fit(frame)
+        categories = {column: sorted(map(str, frame[column].dropna().unique()))
+                      for column in CATEGORICAL_COLUMNS if column in frame.columns}
+        regression = RegressionStats(encoder.n_features)
+        regression.update(encoder.transform(frame), frame[TARGET].to_numpy(dtype=float))
+        return cls(encoder.feature_names, categories, {str(k): int(v) for k, v in pending.items()},
+                   pps_stats, bhk_stats[["count", "mean"]], regression)
+
+    # ------------------------------------------------------------------
+    # Folding in a batch
+    # ------------------------------------------------------------------
+
+    def _assign_locations(self, location):
+        """Known locations pass through; new ones accumulate until promoted."""
+        known = set(self.categories["location"])
+        new = location[~location.isin(known)].value_counts()
+        promoted = []
+        for name, count in new.items():
+            total = self.pending.get(name, 0) + int(count)
+            if total >= RARE_LOCATION_THRESHOLD:
+                self.pending.pop(name, None)
+                promoted.append(name)
+            else:
+                self.pending[name] = total
+        if promoted:
+            promoted.sort()
+            self.categories["location"] = sorted(self.categories["location"] + promoted)
+            self.encoder = FeatureEncoder(self.feature_names + [f"location_{name}" for name in promoted])
+            self.regression.grow(len(promoted))
+        return location.where(location.isin(known.union(promoted)), "Other"), promoted
+
+    def _filter_outliers(self, df):
+        df = df[df.total_sqft / df.bhk >= MIN_SQFT_PER_BHK]
+        for i, stats in enumerate(self.pps_stats):
+            stats = _merge_moments(stats, _moments(df["price_per_sqft"], df["location"]))
+            self.pps_stats[i] = stats
+            row = stats.reindex(df["location"])
+            mean = row["mean"].to_numpy()
+            # ddof=1 like groupby().transform("std"); NaN (single row) keeps nothing
+            with np.errstate(invalid="ignore", divide="ignore"):
+                std = np.sqrt(row["m2"].to_numpy() / (row["count"].to_numpy() - 1))
+            pps = df["price_per_sqft"].to_numpy()
+            df = df[(pps > mean - std) & (pps < mean + std)]
+
+        batch = _moments(df["price_per_sqft"], [df["location"], df["bhk"]])[["count", "mean"]]
+        index = self.bhk_stats.index.union(batch.index)
+        old = self.bhk_stats.reindex(index, fill_value=0.0)
+        new = batch.reindex(index, fill_value=0.0)
+        count = old["count"] + new["count"]
+        self.bhk_stats = pd.DataFrame({
+            "count": count, "mean": (old["mean"] * old["count"] + new["mean"] * new["count"]) / count})
+        mean = self.bhk_stats["mean"]
+        own = mean.reindex(pd.MultiIndex.from_arrays([df["location"], df["bhk"]])).to_numpy()
+        smaller = mean.reindex(pd.MultiIndex.from_arrays([df["location"], df["bhk"] - 1])).to_numpy()
+        return df[~(own < smaller)]
+
+    def update(self, raw):
+        """Fold a batch of raw listings (bengaluru_house_prices.csv layout) into the model."""
+        cleaned = clean_listings(raw, rare_location_threshold=0)
+        cleaned = _bhk_as_int(cleaned.assign(location=cleaned["location"].astype(str)))
+        cleaned["location"], promoted = self._assign_locations(cleaned["location"])
+        kept = self._filter_outliers(cleaned)
+
+        frame = _training_frame(kept)
+        # Area types the model has never seen cannot be encoded; leave them out
+        known = frame["area_type"].astype(str).isin(self.categories["area_type"])
+        frame = frame[known]
+        self.regression.update(self.encoder.transform(frame), frame[TARGET].to_numpy(dtype=float))
+        return {"raw": len(raw), "cleaned": len(cleaned), "kept": len(frame),
+                "unknown_area_type": int((~known).sum()), "promoted": promoted}
+
+    def to_linear_regression(self):
+        coef, intercept, rank, singular, rmse = self.regression.solve()
+        model = LinearRegression()
+        model.coef_ = coef
+        model.intercept_ = float(intercept)
+        model.rank_ = int(rank)
+        model.singular_ = singular
+        model.n_features_in_ = len(coef)
+        return model, rmse
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path=STATE_PATH):
+        header = {
+            "version": STATE_VERSION, "feature_names": self.feature_names,
+            "categories": self.categories, "pending": self.pending,
+            "n": self.regression.n, "mean_y": self.regression.mean_y, "syy": self.regression.syy,
+            "pps_locations": [list(map(str, stats.index)) for stats in self.pps_stats],
+            "bhk_locations": list(map(str, self.bhk_stats.index.get_level_values(0))),
+        }
+        arrays = {f"pps_{i}": stats[_MOMENT_COLUMNS].to_numpy(dtype=float)
+                  for i, stats in enumerate(self.pps_stats)}
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, header=json.dumps(header), mean_x=self.regression.mean_x,
+                 sxx=self.regression.sxx, sxy=self.regression.sxy,
+                 bhk=self.bhk_stats.index.get_level_values(1).to_numpy(dtype=np.int64),
+                 bhk_stats=self.bhk_stats[["count", "mean"]].to_numpy(dtype=float), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        with np.load(path) as data:
+            header = json.loads(str(data["header"]))
+            if header["version"] != STATE_VERSION:
+                raise ValueError(f"{path}: state version {header['version']}, expected {STATE_VERSION}")
+            regression = RegressionStats(len(header["feature_names"]))
+            regression.n, regression.mean_y, regression.syy = header["n"], header["mean_y"], header["syy"]
+            regression.mean_x, regression.sxx, regression.sxy = data["mean_x"], data["sxx"], data["sxy"]
+            pps_stats = [pd.DataFrame(data[f"pps_{i}"], columns=_MOMENT_COLUMNS,
+                                      index=pd.Index(locations, name="location"))
+                         for i, locations in enumerate(header["pps_locations"])]
+            bhk_index = pd.MultiIndex.from_arrays([header["bhk_locations"], data["bhk"]],
+                                                  names=["location", "bhk"])
+            bhk_stats = pd.DataFrame(data["bhk_stats"], columns=["count", "mean"], index=bhk_index)
+        return cls(header["feature_names"], header["categories"], header["pending"],
+                   pps_stats, bhk_stats, regression)
+
+
+def _training_frame(df):
+    """Outlier-filtered rows -> model inputs, as train.load_training_frame prepares them."""
+    frame = df[[c for c in CATEGORICAL_COLUMNS + NUMERIC_COLUMNS + [TARGET] if c in df.columns]].copy()
+    frame["location"] = frame["location"].astype(str)
+    frame["availability"] = normalize_availability(frame["availability"])
+    return frame
+
+
+def _dump_atomic(obj, path):
+    # Running workers may be reading the old file; they see it whole or the new one whole
+    handle, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(handle, "wb") as f:
+            pickle.dump(obj, f)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def write_model(state, output_dir="."):
+    model, rmse = state.to_linear_regression()
+    _dump_atomic(model, os.path.join(output_dir, MODEL_PATH))
+    _dump_atomic(state.feature_names, os.path.join(output_dir, FEATURE_NAMES_PATH))
+    export_artifact(model, state.feature_names, os.path.join(output_dir, ARTIFACT_PATH))
+    return rmse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally update the linear house price model.")
+    parser.add_argument("--state", default=STATE_PATH)
+    parser.add_argument("--output-dir", default=".")
+    sub = parser.add_subparsers(dest="command", required=True)
+    init = sub.add_parser("init", help="build the state from the full raw dataset")
+    init.add_argument("raw", nargs="?", default=RAW_DATA_PATH)
+    init.add_argument("--write-model", action="store_true",
+                      help="also write best_model.pkl from the initial state")
+    update = sub.add_parser("update", help="fold a batch of new raw listings into the model")
+    update.add_argument("batch")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == "init":
+        state = IncrementalModel.from_raw(args.raw)
+        state.save(args.state)
+        print(f"✔ State from {state.regression.n:,} rows, {len(state.feature_names)} features → {args.state}")
+        if args.write_model:
+            rmse = write_model(state, args.output_dir)
+            print(f"✔ Saved → {MODEL_PATH}, {FEATURE_NAMES_PATH}, {ARTIFACT_PATH} (train RMSE {rmse:.4f})")
+    else:
+        state = IncrementalModel.load(args.state)
+        summary = state.update(pd.read_csv(args.batch))
+        state.save(args.state)
+        rmse = write_model(state, args.output_dir)
+        print(f"{summary['raw']:,} new listings → {summary['kept']:,} folded in "
+              f"({summary['cleaned']:,} after cleaning, {summary['unknown_area_type']} unknown area type); "
+              f"{state.regression.n:,} rows total")
+        if summary["promoted"]:
+            print(f"New location features: {', '.join(summary['promoted'])}")
+        print(f"✔ Saved → {MODEL_PATH}, {FEATURE_NAMES_PATH}, {ARTIFACT_PATH} (train RMSE {rmse:.4f})")
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
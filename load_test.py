@@ -0,0 +1,120 @@
+"""Load generator for prediction_service.py.
+
+Opens --concurrency keep-alive connections and fires /predict requests for
+--duration seconds, then reports p50/p99 latency and requests/sec.
+
+Example:
+    python prediction_service.py &
+    python load_test.py --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import pickle
+import random
+import time
+
+import numpy as np
+
+from predictor import FEATURE_NAMES_PATH
+
+AREA_TYPES = ["Super built-up  Area", "Built-up  Area", "Plot  Area", "Carpet  Area"]
+
+
+def sample_records(n, locations, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        bhk = rng.randint(1, 5)
+        records.append({
+            "total_sqft": rng.randint(400, 4000),
+            "bath": rng.randint(1, bhk + 1),
+            "balcony": rng.randint(0, 3),
+            "bhk": bhk,
+            "location": rng.choice(locations),
+            "area_type": rng.choice(AREA_TYPES),
+        })
+    return records
+
+
+async def _request(reader, writer, host, path, body):
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, path, bodies, stop_at, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        i = 0
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            status = await _request(reader, writer, host, path, bodies[i % len(bodies)])
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, concurrency, duration, path, bodies):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    stop_at = start + duration
+    await asyncio.gather(*(
+        _client(host, port, path, bodies[c::concurrency] or bodies, stop_at, latencies, errors)
+        for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return np.array(latencies), errors, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the prediction service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="records per request via /predict/batch (0 = single /predict)")
+    parser.add_argument("--features", default=FEATURE_NAMES_PATH)
+    args = parser.parse_args(argv)
+
+    with open(args.features, "rb") as f:
+        feature_names = pickle.load(f)
+    locations = [name[len("location_"):] for name in feature_names if name.startswith("location_")]
+    records = sample_records(10_000, locations)
+    if args.batch_size:
+        path = "/predict/batch"
+        bodies = [json.dumps({"records": records[i:i + args.batch_size]}).encode()
+                  for i in range(0, len(records), args.batch_size)]
+    else:
+        path = "/predict"
+        bodies = [json.dumps(r).encode() for r in records]
+
+    latencies, errors, elapsed = asyncio.run(
+        run_load(args.host, args.port, args.concurrency, args.duration, path, bodies))
+    if not len(latencies):
+        print("No requests completed.")
+        return
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"Requests: {len(latencies):,} in {elapsed:.2f}s, errors: {len(errors)}")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} req/s"
+          + (f" ({len(latencies) * args.batch_size / elapsed:,.0f} records/s)" if args.batch_size else ""))
+    print(f"Latency: p50={p50:.2f}ms  p99={p99:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
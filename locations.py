@@ -0,0 +1,415 @@
+"""Resolve free-text location strings onto the locations the model knows.
+
+Raw listings spell the same place several ways (" Devarachikkanahalli",
+"Electronic City Phase II" / "Electronic city phase 2", ...), while the
+model only has a coefficient for the exact ``location_<name>`` columns in
+feature_names. LocationResolver maps each string in four steps:
+
+1. normalise (case, punctuation, spaces, ordinals, roman numerals) and
+   look the result up in a hash map of the trained names, then do the same
+   with the words in sorted order ("JP Nagar 7th phase" is "7th Phase JP
+   Nagar") - confidence 1.0. The trained names include the reference
+   location, the one one-hot encoding dropped (" Devarachikkanahalli"):
+   it has no column of its own and is priced by the all-zero encoding;
+2. otherwise, if it is one of the raw names training grouped into "Other"
+   (fewer than RARE_LOCATION_THRESHOLD listings), keep it there: "Adugodi"
+   is a place of its own, not a misspelling of "Kadugodi" - confidence 0.0;
+3. otherwise take the trained names with the same numbers in it that are
+   closest by trigram similarity (Dice coefficient over an inverted
+   trigram index, at least MIN_SIMILARITY) and accept the nearest one that
+   is a plausible misspelling: within max_edits() insertions, deletions,
+   substitutions or adjacent transpositions, and not just a longer or
+   shorter name containing the other - confidence is 1 - edits / length;
+4. otherwise fall back to "Other" - confidence 0.0.
+
+The index is built once from feature_names plus the reference location,
+which is read from the cleaned training listings; the grouped raw names are
+read from the raw dataset the first time a string gets past step 1. Batches are
+resolved per distinct string, and the strings without an exact match are
+scored together with one sparse matrix product, so bulk inputs resolve at
+hundreds of thousands of rows per second.
+
+    resolver = LocationResolver.from_feature_names(feature_names)
+    resolver.resolve_one("electronic city phase 2")  # ("Electronic City Phase II", 1.0)
+    resolver.resolve_one("whitefeild")               # ("Whitefield", 0.9)
+"""
+import argparse
+import os
+import re
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from metrics import LOCATION_RESOLUTIONS
+
+OTHER_LOCATION = "Other"
+RAW_DATA_PATH = "bengaluru_house_prices.csv"
+TRAINING_DATA_PATH = "after_outlier_removal.csv"
+MIN_SIMILARITY = 0.5
+FUZZY_CANDIDATES = 3
+SEARCH_MIN_SIMILARITY = 0.4
+FUZZY_CACHE_SIZE = 65_536
+FUZZY_CHUNK_ROWS = 4096
+
+# How a string was resolved, as recorded in LOCATION_RESOLUTIONS
+MATCHES = ("exact", "fuzzy", "fallback")
+EXACT, FUZZY, FALLBACK = range(len(MATCHES))
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+_DIGITS = re.compile(r"[0-9]+")
+_ORDINAL = re.compile(r"([0-9]+) ?(?:st|nd|rd|th)\b")
+_ROMAN = {"i": "1", "ii": "2", "iii": "3", "iv": "4", "v": "5", "vi": "6", "vii": "7", "viii": "8"}
+_ROMAN_WORD = r"\b(?:i|ii|iii|iv|v|vi|vii|viii)\b"
+
+
+def _roman_to_digits(text):
+    return " ".join(_ROMAN.get(word, word) for word in text.split())
+
+
+def location_words(text):
+    """Lowercase words with ordinals and roman numerals as digits and no punctuation."""
+    return _roman_to_digits(_ORDINAL.sub(r"\1", _NON_WORD.sub(" ", str(text).lower())))
+
+
+def normalize_location(text):
+    """Lookup key: location_words() without the spaces.
+
+    Spaces are dropped so "Akshayanagar" and "Akshaya Nagar" get the same key.
+    """
+    return location_words(text).replace(" ", "")
+
+
+def token_key(words):
+    """location_words() output in sorted order, so "JP Nagar 7th Phase" is "7th Phase JP Nagar"."""
+    return " ".join(sorted(words.split()))
+
+
+def _location_words(values):
+    # location_words() over an array-like, as a pandas string Series
+    text = pd.Series(values, dtype="string").str.lower()
+    text = text.str.replace(_NON_WORD.pattern, " ", regex=True).str.replace(_ORDINAL.pattern, r"\1", regex=True)
+    roman = text.str.contains(_ROMAN_WORD, regex=True).fillna(False).to_numpy(dtype=bool)
+    if roman.any():
+        text[roman] = [_roman_to_digits(value) for value in text[roman]]
+    return text
+
+
+def normalize_locations(values):
+    """normalize_location() over an array-like, with pandas string methods
+    (vectorised when pandas strings are Arrow-backed). Missing values stay None."""
+    return _location_words(values).str.replace(" ", "", regex=False).to_numpy(dtype=object, na_value=None)
+
+
+def number_key(normalized):
+    """The numbers in a name ("2nd Block" vs "5th Block"), which a fuzzy match must keep."""
+    return " ".join(_DIGITS.findall(normalized))
+
+
+def max_edits(length):
+    """Edits a misspelling of a ``length``-character key may contain."""
+    return 1 + length // 15
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions), or limit + 1 as soon as it must exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def bucketed_locations(path=RAW_DATA_PATH):
+    """Raw location names that preprocessing grouped into "Other", or [] without the raw data."""
+    from dataset_cache import load_dataset
+    from preprocessing import ESSENTIAL_COLUMNS, RARE_LOCATION_THRESHOLD, clean_listings
+
+    if not os.path.exists(path):
+        return []
+    raw = load_dataset(path, columns=sorted(set(ESSENTIAL_COLUMNS) | {"price"}))
+    # Counted after the incomplete rows are dropped, as clean_listings counts them
+    counts = clean_listings(raw, rare_location_threshold=0)["location"].value_counts()
+    return [str(name) for name, count in counts.items() if 0 < count < RARE_LOCATION_THRESHOLD]
+
+
+def reference_location(feature_names, path=TRAINING_DATA_PATH):
+    """The location get_dummies(drop_first=True) dropped from feature_names, or None.
+
+    It is the first training location in sorted order, so it is read from
+    the cleaned listings; None without them, or if their first location is
+    not one sorting before every location column.
+    """
+    prefix = "location_"
+    trained = [name[len(prefix):] for name in feature_names if name.startswith(prefix)]
+    if not trained or not os.path.exists(path):
+        return None
+    first = pd.read_csv(path, usecols=["location"])["location"].dropna().astype(str).min()
+    return first if first < min(trained) else None
+
+
+# Keys only contain [0-9a-z] (plus the padding spaces), so every trigram is
+# a number below 37 ** 3 and trigram -> column lookups are a dense table
+_ALPHABET = " abcdefghijklmnopqrstuvwxyz0123456789"
+_SYMBOL = np.zeros(256, dtype=np.int64)
+_SYMBOL[np.frombuffer(_ALPHABET.encode("ascii"), dtype=np.uint8)] = np.arange(len(_ALPHABET))
+N_TRIGRAMS = len(_ALPHABET) ** 3
+
+
+def trigrams(keys):
+    """Distinct trigrams of each normalised key, as (row, trigram code) integer arrays."""
+    padded = [f"  {key} " for key in keys]
+    windows = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded)) - 2
+    symbols = _SYMBOL[np.frombuffer("".join(padded).encode("ascii"), dtype=np.uint8)]
+    rows = np.repeat(np.arange(len(padded)), windows)
+    # Window i of key k starts at offset(k) + i; offsets grow by windows + 2 per key
+    first = np.cumsum(windows + 2) - (windows + 2)
+    positions = np.arange(len(rows)) + np.repeat(first - (np.cumsum(windows) - windows), windows)
+    codes = (symbols[positions] * len(_ALPHABET) + symbols[positions + 1]) * len(_ALPHABET) + symbols[positions + 2]
+    # Deduplicate within each key; a plain sort is much cheaper than np.unique here
+    packed = np.sort(rows * N_TRIGRAMS + codes)
+    packed = packed[np.append(True, packed[1:] != packed[:-1])] if len(packed) else packed
+    return packed // N_TRIGRAMS, packed % N_TRIGRAMS
+
+
+class LocationResolver:
+    """Exact + trigram-fuzzy lookup of location names, with an 'Other' fallback.
+
+    ``other_locations`` are the raw names training grouped into "Other";
+    None reads them from the raw dataset (bucketed_locations) when first needed.
+    ``reference`` is the location without a feature column (see
+    reference_location); it resolves like any trained name.
+    """
+
+    def __init__(self, locations, min_similarity=MIN_SIMILARITY, other_locations=None, reference=None):
+        self.reference = reference
+        self.locations = sorted(set(locations) | ({reference} if reference is not None else set()))
+        self.min_similarity = min_similarity
+        self.fallback = OTHER_LOCATION
+        keys = [normalize_location(name) for name in self.locations]
+        self.keys = np.array(keys, dtype=object)
+        self.exact = {}
+        self.reordered = {}
+        for key, name in zip(keys, self.locations):
+            self.exact.setdefault(key, name)
+            self.reordered.setdefault(token_key(location_words(name)), name)
+        self._other_locations = other_locations
+        self._bucketed = None
+
+        # Inverted index as a sparse (trigram x location) matrix, so a whole
+        # batch of strings is scored against every location in one product
+        owners, codes = trigrams(keys)
+        vocabulary, grams = np.unique(codes, return_inverse=True)
+        self.trigram_columns = np.full(N_TRIGRAMS, -1, dtype=np.int64)
+        self.trigram_columns[vocabulary] = np.arange(len(vocabulary))
+        self.trigram_matrix = sp.csr_matrix((np.ones(len(grams), dtype=np.float32), (grams, owners)),
+                                            shape=(len(vocabulary), len(self.locations)))
+        self.trigram_counts = np.bincount(owners, minlength=len(self.locations)).astype(np.float32)
+        self.number_groups = {}
+        self.location_numbers = np.array(
+            [self.number_groups.setdefault(number_key(key), len(self.number_groups)) for key in keys])
+        self._fuzzy = lru_cache(maxsize=FUZZY_CACHE_SIZE)(self._fuzzy_one)
+
+    @classmethod
+    def from_feature_names(cls, feature_names, min_similarity=MIN_SIMILARITY, other_locations=None,
+                           training_path=TRAINING_DATA_PATH):
+        prefix = "location_"
+        return cls([name[len(prefix):] for name in feature_names if name.startswith(prefix)], min_similarity,
+                   other_locations, reference_location(feature_names, training_path))
+
+    def __len__(self):
+        return len(self.locations)
+
+    @property
+    def bucketed(self):
+        """Normalised and word-sorted keys of the raw names training grouped into "Other"."""
+        if self._bucketed is None:
+            names = self._other_locations
+            if names is None:
+                names = bucketed_locations()
+            words = [location_words(name) for name in names]
+            self._bucketed = frozenset([w.replace(" ", "") for w in words] + [token_key(w) for w in words])
+        return self._bucketed
+
+    def _lookup(self, key, words):
+        """(location, confidence, match) from steps 1 and 2 of the module docstring, or None."""
+        name = self.exact.get(key)
+        if name is not None:
+            return name, 1.0, EXACT
+        words = token_key(words)
+        name = self.reordered.get(words)
+        if name is not None:
+            return name, 1.0, EXACT
+        if key in self.bucketed or words in self.bucketed:
+            return self.fallback, 0.0, FALLBACK
+        return None
+
+    def _scores(self, keys, same_numbers=True):
+        """Dice similarity (len(keys) x locations) of normalised strings to every location."""
+        rows, codes = trigrams(keys)
+        sizes = np.bincount(rows, minlength=len(keys)).astype(np.float32)
+        cols = self.trigram_columns[codes]
+        known = cols >= 0
+        query = sp.csr_matrix((np.ones(known.sum(), dtype=np.float32), (rows[known], cols[known])),
+                              shape=(len(keys), self.trigram_matrix.shape[0]))
+        scores = (query @ self.trigram_matrix).toarray()
+        scores *= 2.0
+        scores /= sizes[:, None] + self.trigram_counts
+        if same_numbers:
+            # "Sector 1 HSR Layout" is not "Sector 2 HSR Layout", however similar the spelling
+            numbers = pd.Series(keys, dtype="string").str.replace(r"[^0-9]+", " ", regex=True).str.strip()
+            numbers = numbers.map(self.number_groups).fillna(-1).to_numpy(dtype=np.int64)
+            scores *= numbers[:, None] == self.location_numbers
+        return scores
+
+    def _closest(self, key, candidates):
+        """The candidate location a plausible misspelling of ``key`` is closest to, as (index, edits)."""
+        limit = max_edits(len(key))
+        best, best_edits = None, limit + 1
+        for index in candidates:
+            other = self.keys[index]
+            if key in other or other in key:
+                # "Adugodi" is not "Kadugodi", nor "Doddakammanahalli" "Kammanahalli"
+                continue
+            edits = edit_distance(key, other, min(limit, best_edits - 1))
+            if edits < best_edits:
+                best, best_edits = index, edits
+        return best, best_edits
+
+    def _fuzzy_match(self, keys):
+        """Best location and confidence for each normalised string without an exact match."""
+        names = np.full(len(keys), self.fallback, dtype=object)
+        confidence = np.zeros(len(keys))
+        top = min(FUZZY_CANDIDATES, len(self.locations))
+        for start in range(0, len(keys), FUZZY_CHUNK_ROWS):
+            scores = self._scores(keys[start:start + FUZZY_CHUNK_ROWS])
+            # Most similar locations first; only rows with a candidate need an edit distance
+            candidates = np.argsort(-scores, axis=1, kind="stable")[:, :top]
+            close = np.take_along_axis(scores, candidates, axis=1) >= self.min_similarity
+            for row in np.flatnonzero(close[:, 0]):
+                key = keys[start + row]
+                index, edits = self._closest(key, candidates[row][close[row]])
+                if index is not None:
+                    names[start + row] = self.locations[index]
+                    confidence[start + row] = round(1.0 - edits / max(len(key), len(self.keys[index])), 4)
+        return names, confidence
+
+    def _fuzzy_one(self, key):
+        names, confidence = self._fuzzy_match([key])
+        return names[0], float(confidence[0])
+
+    def resolve_one(self, text):
+        """(location, confidence) for a single string."""
+        if text is None or text is pd.NA or (isinstance(text, float) and np.isnan(text)):
+            LOCATION_RESOLUTIONS.inc("fallback")
+            return self.fallback, 0.0
+        words = location_words(text)
+        key = words.replace(" ", "")
+        found = self._lookup(key, words)
+        if found is not None:
+            name, confidence, match = found
+        else:
+            name, confidence = self._fuzzy(key)
+            match = FUZZY if confidence else FALLBACK
+        LOCATION_RESOLUTIONS.inc(MATCHES[match])
+        return name, confidence
+
+    def resolve(self, values):
+        """Resolve an array-like of strings; returns (locations, confidences) arrays."""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        words = _location_words(uniques)
+        keys = words.str.replace(" ", "", regex=False).to_numpy(dtype=object, na_value=None)
+        words = words.to_numpy(dtype=object, na_value=None)
+        # One extra slot for missing values, which factorize codes as -1
+        names = np.append(pd.Series(keys, dtype=object).map(self.exact).to_numpy(dtype=object), self.fallback)
+        confidence = np.append(np.ones(len(keys)), 0.0)
+        matches = np.append(np.full(len(keys), EXACT, dtype=np.int8), FALLBACK)
+        unmatched = []
+        for i in np.flatnonzero(pd.isna(names[:-1])):
+            found = self._lookup(keys[i], words[i])
+            if found is None:
+                unmatched.append(i)
+            else:
+                names[i], confidence[i], matches[i] = found
+        if unmatched:
+            names[unmatched], confidence[unmatched] = self._fuzzy_match(keys[unmatched])
+            matches[unmatched] = np.where(confidence[unmatched] > 0, FUZZY, FALLBACK)
+        for match, count in zip(MATCHES, np.bincount(matches[codes], minlength=len(MATCHES))):
+            if count:
+                LOCATION_RESOLUTIONS.inc(match, amount=int(count))
+        return names[codes], confidence[codes]
+
+    def search(self, text, limit=10):
+        """Up to ``limit`` location names best matching a partial string, for type-ahead."""
+        normalized = normalize_location(text)
+        if not normalized:
+            return self.locations[:limit]
+        # Names starting with the text, then names containing it, then near spellings
+        prefixed = sorted(name for key, name in self.exact.items() if key.startswith(normalized))
+        matches = prefixed + sorted(name for key, name in self.exact.items()
+                                    if normalized in key and name not in prefixed)
+        if len(matches) < limit:
+            scores = self._scores([normalized], same_numbers=False)[0]
+            matches += [self.locations[i] for i in np.argsort(-scores, kind="stable")[:limit]
+                        if scores[i] >= SEARCH_MIN_SIMILARITY and self.locations[i] not in matches]
+        return matches[:limit]
+
+
+def bench(resolver, values, seed=0):
+    """Rows per second resolving ``values`` as given, and with every row made
+    a distinct misspelling (the worst case: nothing to deduplicate)."""
+    resolver.bucketed  # read from the raw dataset once, outside the timings
+    start = time.perf_counter()
+    names, confidence = resolver.resolve(values)
+    typical = len(values) / (time.perf_counter() - start)
+
+    rng = np.random.default_rng(seed)
+    n = min(len(values), 100_000)
+    distinct = [f"{resolver.locations[i]} {j}" for j, i in enumerate(rng.integers(0, len(resolver), n))]
+    start = time.perf_counter()
+    resolver.resolve(distinct)
+    worst = n / (time.perf_counter() - start)
+    return names, confidence, typical, worst
+
+
+def main(argv=None):
+    from predictor import FEATURE_NAMES_PATH, MODEL_PATH, load_model_and_features
+
+    parser = argparse.ArgumentParser(description="Resolve raw location strings against the trained locations.")
+    parser.add_argument("input", nargs="?", default="bengaluru_house_prices.csv",
+                        help="CSV with a location column (default: the raw dataset)")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--features", default=FEATURE_NAMES_PATH)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows to resolve for the timing")
+    args = parser.parse_args(argv)
+
+    _, feature_names = load_model_and_features(args.model, args.features)
+    resolver = LocationResolver.from_feature_names(feature_names)
+    raw = pd.read_csv(args.input, usecols=["location"])["location"].to_numpy(dtype=object)
+    values = np.resize(raw, args.rows)
+    names, confidence, typical, worst = bench(resolver, values)
+
+    exact = (confidence == 1.0).mean()
+    fuzzy = ((confidence > 0) & (confidence < 1)).mean()
+    print(f"{len(resolver)} trained locations, {len(pd.unique(raw))} distinct input strings")
+    print(f"{exact:.1%} exact, {fuzzy:.1%} fuzzy, {1 - exact - fuzzy:.1%} -> {resolver.fallback}")
+    print(f"{typical:,.0f} rows/s on this input, {worst:,.0f} rows/s with every string distinct")
+    fuzzy_rows = pd.DataFrame({"input": values, "location": names, "confidence": confidence})
+    fuzzy_rows = fuzzy_rows[(fuzzy_rows.confidence > 0) & (fuzzy_rows.confidence < 1)].drop_duplicates("input")
+    print(fuzzy_rows.sort_values("confidence").head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
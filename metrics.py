@@ -0,0 +1,321 @@
+"""In-process counters and histograms for the prediction hot paths.
+
+Each thread records into its own accumulator, without taking a lock;
+readers add the threads' accumulators up. A histogram observe() costs
+about half a microsecond, so the hooks stay on in production, but they sit
+at request and batch boundaries, never per row. Everything registered on
+REGISTRY can be read in the Prometheus text format:
+
+    GET /metrics on prediction_service.py
+    start_http_server(port)      standalone endpoint, e.g. for the Streamlit app
+    start_log_dump(interval)     periodic dump to the "metrics" logger
+
+The app turns the last two on with the METRICS_PORT / METRICS_LOG_INTERVAL
+environment variables.
+"""
+import logging
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; spans a cached lookup (~1 µs) up to a cold model load
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+SIZE_BUCKETS = (1, 2, 5, 10, 50, 100, 500, 1000, 5000, 10_000, 100_000)
+# Lakhs; absolute price differences between two models
+PRICE_DIFF_BUCKETS = (0.01, 0.1, 0.5, 1, 2, 5, 10, 25, 50, 100)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{str(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _ThreadShards:
+    """One accumulator per thread, updated lock-free by its own thread.
+
+    A lock is only taken to add a thread's accumulator, to fold it into
+    ``retired`` when the thread exits (Streamlit runs each script run on a
+    new thread, so they must not pile up), and to read the total.
+    """
+
+    def __init__(self, new, merge):
+        self._new = new
+        self._merge = merge
+        self._local = threading.local()
+        self._live = {}
+        self._retired = new()
+        self._lock = threading.Lock()
+
+    def get(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            pass
+        shard, owner = self._new(), _ThreadToken()
+        with self._lock:
+            self._live[id(shard)] = shard
+        # owner lives exactly as long as this thread's local storage
+        weakref.finalize(owner, self._retire, shard)
+        self._local.shard, self._local.owner = shard, owner
+        return shard
+
+    def _retire(self, shard):
+        with self._lock:
+            del self._live[id(shard)]
+            self._merge(self._retired, shard)
+
+    def total(self):
+        total = self._new()
+        with self._lock:
+            for shard in (self._retired, *self._live.values()):
+                self._merge(total, shard)
+        return total
+
+
+class _ThreadToken:
+    pass
+
+
+def _merge_counts(total, shard):
+    for labels, value in list(shard.items()):
+        total[labels] = total.get(labels, 0) + value
+
+
+def _merge_lists(total, shard):
+    for i, value in enumerate(shard):
+        total[i] += value
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._shards = _ThreadShards(dict, _merge_counts)
+
+    def inc(self, *labels, amount=1):
+        values = self._shards.get()
+        values[labels] = values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._shards.total().get(labels, 0)
+
+    def samples(self):
+        for labels, value in sorted(self._shards.total().items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class _HistogramSeries:
+    """Bucket counts, sum and count for one set of label values.
+
+    Each thread's accumulator is a list: the bucket counts (+Inf last),
+    then the sum, then the count.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        size = len(buckets) + 3
+        self._shards = _ThreadShards(lambda: [0] * size, _merge_lists)
+        self._local = self._shards._local
+
+    def observe(self, value):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shards.get()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-2] += value
+        shard[-1] += 1
+
+    def observe_many(self, values):
+        shard = self._shards.get()
+        for value in values:
+            shard[bisect_left(self.buckets, value)] += 1
+        shard[-2] += sum(values)
+        shard[-1] += len(values)
+
+    def snapshot(self):
+        """(bucket counts, sum, count) across all threads."""
+        total = self._shards.total()
+        return total[:-2], total[-2], total[-1]
+
+    @property
+    def sum(self):
+        return self.snapshot()[1]
+
+    @property
+    def count(self):
+        return self.snapshot()[2]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values.
+
+    Hot paths bind a series once with ``labels(...)`` and call its observe(),
+    which skips the per-call label lookup.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS, labels=()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(values, _HistogramSeries(self.buckets))
+        return series
+
+    def observe(self, value, *labels):
+        self.labels(*labels).observe(value)
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return series.count if series else 0
+
+    def samples(self):
+        with self._lock:
+            series = dict(self._series)
+        names = self.label_names + ("le",)
+        for labels, s in sorted(series.items()):
+            counts, total, count = s.snapshot()
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), counts):
+                cumulative += n
+                le = bound if bound == "+Inf" else _number(bound)
+                yield f"{self.name}_bucket{_labels(names, labels + (le,))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self.register(Counter(name, help, labels))
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS, labels=()):
+        return self.register(Histogram(name, help, buckets, labels))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+PREDICTION_LATENCY = REGISTRY.histogram(
+    "house_price_prediction_latency_seconds",
+    "Time to price a request: single is one record, timed by the app or POST /predict; "
+    "batch is one predict_batch call.", labels=("path",))
+STAGE_LATENCY = REGISTRY.histogram(
+    "house_price_stage_seconds",
+    "Time spent per stage: model_load, encode, predict, chart, render.", labels=("stage",))
+PREDICTIONS_PER_REQUEST = REGISTRY.histogram(
+    "house_price_predictions_per_request", "Rows priced per request.", buckets=SIZE_BUCKETS,
+    labels=("source",))
+CACHE_LOOKUPS = REGISTRY.counter(
+    "house_price_prediction_cache_lookups_total", "Prediction cache lookups by result.", labels=("result",))
+UNKNOWN_LOCATIONS = REGISTRY.counter(
+    "house_price_unknown_location_total", "Rows priced with a location the model has no coefficient for.")
+LOCATION_RESOLUTIONS = REGISTRY.counter(
+    "house_price_location_resolutions_total", "Free-text locations resolved, by match kind.", labels=("match",))
+MODEL_SWAPS = REGISTRY.counter(
+    "house_price_model_swaps_total", "Registry model changes picked up by this process.", labels=("result",))
+SHADOW_LATENCY = REGISTRY.histogram(
+    "house_price_shadow_latency_seconds", "Time per scoring call, live vs. shadow candidate model.",
+    labels=("model",))
+SHADOW_PRICE_DIFF = REGISTRY.histogram(
+    "house_price_shadow_price_diff_lakhs", "Absolute price difference, candidate vs. live, per row.",
+    buckets=PRICE_DIFF_BUCKETS)
+SHADOW_DROPPED = REGISTRY.counter(
+    "house_price_shadow_dropped_total", "Scoring calls not mirrored to the candidate because it fell behind.")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, host="0.0.0.0", registry=REGISTRY):
+    """Serve GET /metrics from a daemon thread; returns the server."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def start_log_dump(interval, registry=REGISTRY, logger=None):
+    """Log the rendered metrics every ``interval`` seconds from a daemon thread."""
+    logger = logger or logging.getLogger("metrics")
+    stop = threading.Event()
+
+    def dump():
+        while not stop.wait(interval):
+            logger.info("metrics\n%s", registry.render())
+
+    threading.Thread(target=dump, name="metrics-log", daemon=True).start()
+    return stop
+
+
+def start_from_env(registry=REGISTRY):
+    """Start the exporters requested by METRICS_PORT / METRICS_LOG_INTERVAL."""
+    port = os.environ.get("METRICS_PORT")
+    interval = os.environ.get("METRICS_LOG_INTERVAL")
+    server = start_http_server(int(port), registry=registry) if port else None
+    stop = start_log_dump(float(interval), registry) if interval else None
+    return server, stop
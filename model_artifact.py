@@ -0,0 +1,319 @@
+"""Pickle-free, memory-mappable model artifacts.
+
+An artifact is an uncompressed .npz holding a JSON header (format version,
+model kind, feature_names, schema hash) plus the model's parameter arrays:
+coefficients for linear models, flattened node arrays for tree models.
+Because members are stored uncompressed, each array is memory-mapped
+straight from the file, so every worker process on a host shares the same
+page-cache copy of the weights and nothing is ever unpickled.
+
+    python model_artifact.py export best_model.pkl feature_names.pkl best_model.npz
+    python model_artifact.py bench best_model.npz
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+FORMAT_VERSION = 1
+ARTIFACT_PATH = "best_model.npz"
+HEADER_KEY = "header"
+
+
+def schema_hash(feature_names):
+    return hashlib.blake2b("\n".join(feature_names).encode(), digest_size=16).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Loaded models: plain numpy predictors over (memory-mapped) parameter arrays
+# ---------------------------------------------------------------------------
+
+class LinearArtifactModel:
+    kind = "linear"
+
+    def __init__(self, coef, intercept):
+        self.coef_ = coef
+        self.intercept_ = float(intercept)
+        self.n_features_in_ = len(coef)
+
+    def predict(self, X):
+        return np.asarray(X @ self.coef_).ravel() + self.intercept_
+
+
+class TreeEnsembleArtifactModel:
+    """Sum/mean of regression trees stored as concatenated node arrays.
+
+    prediction = init + scale * combine(tree outputs), where combine is the
+    mean for random forests and the sum for gradient boosting.
+    """
+    kind = "tree_ensemble"
+
+    def __init__(self, arrays, init, scale, combine, n_features):
+        self.children_left = arrays["children_left"]
+        self.children_right = arrays["children_right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.tree_offsets = arrays["tree_offsets"]
+        self.init = float(init)
+        self.scale = float(scale)
+        self.combine = combine
+        self.n_features_in_ = n_features
+
+    @property
+    def n_trees(self):
+        return len(self.tree_offsets)
+
+    def predict(self, X, chunk_rows=4096):
+        sparse = hasattr(X, "toarray")
+        X = X.tocsr() if sparse else np.asarray(X)
+        out = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], chunk_rows):
+            chunk = X[start:start + chunk_rows]
+            # Sparse input is densified one chunk at a time, never as a whole;
+            # sklearn compares float32 features against float64 thresholds
+            chunk = np.asarray(chunk.toarray() if sparse else chunk, dtype=np.float32)
+            out[start:start + chunk_rows] = self._predict_chunk(chunk)
+        return out
+
+    def _predict_chunk(self, X):
+        # Walk all trees at once: one (rows x trees) node matrix, one step per depth level
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.tree_offsets, (X.shape[0], self.n_trees)).copy()
+        while True:
+            left = self.children_left[node]
+            internal = left >= 0
+            if not internal.any():
+                break
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(internal, np.where(go_left, left, self.children_right[node]), node)
+        values = self.value[node]
+        total = values.mean(axis=1) if self.combine == "mean" else values.sum(axis=1)
+        return self.init + self.scale * total
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _flatten_trees(trees):
+    """Concatenate sklearn Tree objects into global node arrays."""
+    parts = {k: [] for k in ("children_left", "children_right", "feature", "threshold", "value")}
+    offsets, offset = [], 0
+    for tree in trees:
+        t = tree.tree_
+        left = t.children_left.astype(np.int64)
+        right = t.children_right.astype(np.int64)
+        parts["children_left"].append(np.where(left >= 0, left + offset, -1))
+        parts["children_right"].append(np.where(right >= 0, right + offset, -1))
+        parts["feature"].append(np.maximum(t.feature, 0).astype(np.int64))
+        parts["threshold"].append(t.threshold.astype(np.float64))
+        parts["value"].append(t.value[:, 0, 0].astype(np.float64))
+        offsets.append(offset)
+        offset += t.node_count
+    arrays = {k: np.concatenate(v) for k, v in parts.items()}
+    arrays["tree_offsets"] = np.array(offsets, dtype=np.int64)
+    return arrays
+
+
+def model_to_arrays(model):
+    """(header fields, arrays) describing a fitted sklearn model."""
+    name = type(model).__name__
+    if hasattr(model, "coef_") and np.ndim(model.coef_) == 1:
+        return ({"kind": "linear", "estimator": name, "intercept": float(model.intercept_)},
+                {"coef": np.asarray(model.coef_, dtype=np.float64)})
+    if name == "DecisionTreeRegressor":
+        return ({"kind": "tree_ensemble", "estimator": name, "init": 0.0, "scale": 1.0, "combine": "sum"},
+                _flatten_trees([model]))
+    if name == "RandomForestRegressor":
+        return ({"kind": "tree_ensemble", "estimator": name, "init": 0.0, "scale": 1.0, "combine": "mean"},
+                _flatten_trees(model.estimators_))
+    if name == "GradientBoostingRegressor":
+        if model.loss != "squared_error" or model.init not in (None, "zero"):
+            raise ValueError("only squared_error GradientBoostingRegressor with default init is supported")
+        init = 0.0 if model.init == "zero" else float(model.init_.constant_.ravel()[0])
+        return ({"kind": "tree_ensemble", "estimator": name, "init": init,
+                 "scale": float(model.learning_rate), "combine": "sum"},
+                _flatten_trees(model.estimators_[:, 0]))
+    raise ValueError(f"unsupported model type for artifact export: {name}")
+
+
+def export_artifact(model, feature_names, path=ARTIFACT_PATH):
+    feature_names = list(feature_names)
+    header, arrays = model_to_arrays(model)
+    header.update(format_version=FORMAT_VERSION, feature_names=feature_names,
+                  schema_hash=schema_hash(feature_names))
+    header_bytes = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+    # Written beside the target and renamed over it: running workers may
+    # have the old file memory-mapped, and must never see it rewritten
+    handle, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(handle, "wb") as f:
+            # Uncompressed on purpose: stored members can be memory-mapped in place
+            np.savez(f, **{HEADER_KEY: header_bytes}, **arrays)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Load
+# ---------------------------------------------------------------------------
+
+def _mmap_npz(path):
+    """Memory-map every member of an uncompressed .npz."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: member {info.filename} is compressed; cannot memory-map")
+            f.seek(info.header_offset)
+            local = f.read(30)
+            name_len, extra_len = struct.unpack("<HH", local[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"{path}: object arrays are not allowed")
+            key = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            arrays[key] = np.memmap(path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                                    order="F" if fortran else "C")
+    return arrays
+
+
+def validate_schema(header, arrays, expected_feature_names=None):
+    """Check the artifact's feature schema against the shared encoder."""
+    # Imported here so reading an artifact's header needs only numpy (see read_feature_names)
+    from features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, FeatureEncoder
+
+    if header.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"unsupported artifact format version {header.get('format_version')}")
+    names = header["feature_names"]
+    if schema_hash(names) != header["schema_hash"]:
+        raise ValueError("artifact feature_names do not match their schema hash")
+    if expected_feature_names is not None and list(expected_feature_names) != names:
+        raise ValueError("artifact was trained on a different feature layout")
+    encoder = FeatureEncoder(names)
+    missing = [c for c in NUMERIC_COLUMNS if c not in encoder.column_index]
+    if missing:
+        raise ValueError(f"artifact is missing numeric features {missing}")
+    unknown = [n for n in names if n not in NUMERIC_COLUMNS
+               and not any(n.startswith(f"{c}_") for c in CATEGORICAL_COLUMNS)]
+    if unknown:
+        raise ValueError(f"artifact has features the encoder cannot produce: {unknown[:5]}")
+    if header["kind"] == "linear" and len(arrays["coef"]) != len(names):
+        raise ValueError("coefficient count does not match feature_names")
+    if header["kind"] == "tree_ensemble" and len(arrays["feature"]) and arrays["feature"].max() >= len(names):
+        raise ValueError("tree splits reference features beyond feature_names")
+    return encoder
+
+
+def read_feature_names(path=ARTIFACT_PATH):
+    """An artifact's feature_names, from its header alone (no model load or validation)."""
+    with np.load(path) as archive:
+        header = json.loads(bytes(archive[HEADER_KEY]).decode())
+    return list(header["feature_names"])
+
+
+def load_artifact(path=ARTIFACT_PATH, expected_feature_names=None):
+    """Load (model, feature_names) from an artifact, memory-mapping its arrays."""
+    arrays = _mmap_npz(path)
+    header = json.loads(bytes(arrays.pop(HEADER_KEY)).decode())
+    validate_schema(header, arrays, expected_feature_names)
+    if header["kind"] == "linear":
+        model = LinearArtifactModel(arrays["coef"], header["intercept"])
+    else:
+        model = TreeEnsembleArtifactModel(arrays, header["init"], header["scale"], header["combine"],
+                                          len(header["feature_names"]))
+    model.estimator = header["estimator"]
+    return model, list(header["feature_names"])
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+_COLD_PICKLE = ("import pickle,time;t=time.perf_counter();"
+                "m=pickle.load(open({model!r},'rb'));f=pickle.load(open({features!r},'rb'));"
+                "print(time.perf_counter()-t)")
+_COLD_ARTIFACT = ("import time;t=time.perf_counter();import model_artifact;"
+                  "model_artifact.load_artifact({artifact!r});print(time.perf_counter()-t)")
+
+
+def _cold_load_seconds(code, repeats):
+    runs = [float(subprocess.run([sys.executable, "-W", "ignore", "-c", code], check=True,
+                                 capture_output=True, text=True).stdout) for _ in range(repeats)]
+    return float(np.median(runs))
+
+
+def bench(artifact, model_path, features_path, repeats=5):
+    import pickle
+
+    def warm(load):
+        load()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            load()
+        return (time.perf_counter() - start) / repeats
+
+    def load_pickle():
+        with open(model_path, "rb") as f:
+            pickle.load(f)
+        with open(features_path, "rb") as f:
+            pickle.load(f)
+
+    results = {
+        "pickle_cold_s": _cold_load_seconds(_COLD_PICKLE.format(model=model_path, features=features_path), repeats),
+        "artifact_cold_s": _cold_load_seconds(_COLD_ARTIFACT.format(artifact=artifact), repeats),
+        "pickle_warm_s": warm(load_pickle),
+        "artifact_warm_s": warm(lambda: load_artifact(artifact)),
+    }
+    for key, value in results.items():
+        print(f"{key:>16}: {value * 1000:8.2f} ms")
+    print(f"cold-start speedup: {results['pickle_cold_s'] / results['artifact_cold_s']:.1f}x "
+          "(cold includes importing everything needed to load)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or benchmark memory-mappable model artifacts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="convert best_model.pkl + feature_names.pkl to an artifact")
+    exp.add_argument("model", nargs="?", default="best_model.pkl")
+    exp.add_argument("features", nargs="?", default="feature_names.pkl")
+    exp.add_argument("output", nargs="?", default=ARTIFACT_PATH)
+    ben = sub.add_parser("bench", help="compare artifact vs pickle load time")
+    ben.add_argument("artifact", nargs="?", default=ARTIFACT_PATH)
+    ben.add_argument("--model", default="best_model.pkl")
+    ben.add_argument("--features", default="feature_names.pkl")
+    ben.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        import pickle
+        with open(args.model, "rb") as f:
+            model = pickle.load(f)
+        with open(args.features, "rb") as f:
+            feature_names = pickle.load(f)
+        export_artifact(model, feature_names, args.output)
+        load_artifact(args.output, feature_names)  # round-trip schema check
+        print(f"Exported {type(model).__name__} → {args.output}")
+    else:
+        bench(args.artifact, args.model, args.features, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
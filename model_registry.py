@@ -0,0 +1,491 @@
+"""Versioned model registry with in-process hot swap and shadow scoring.
+
+A registry is a directory of immutable versions plus two pointer files:
+
+    models/
+        ACTIVE              name of the version serving traffic, e.g. "v0003"
+        SHADOW              optional candidate scored alongside it
+        v0001/model.npz     model artifact (see model_artifact.py)
+        v0001/metadata.json estimator, fingerprint, model_performance.csv row, ...
+
+Versions are written to a staging directory and renamed into place, and
+pointers are replaced with os.replace, so a reader never sees a partial
+version or pointer. Weights are memory-mapped from model.npz, so every
+worker on a host shares one page-cache copy of each version.
+
+A ModelWatcher in each worker polls the pointers and, when they change,
+loads the new predictor next to the old one and swaps a single reference.
+Requests already running keep the predictor they started with; the old
+weights are released when the last of them finishes. With a SHADOW
+version set, the watcher's predictor is a ShadowPredictor: it answers from
+the live model and replays the same calls against the candidate on a
+background thread, recording latency and price differences in metrics.py.
+
+    python model_registry.py register --activate     # best_model.pkl + model_performance.csv
+    python model_registry.py list
+    python model_registry.py shadow v0002            # score v0002 in the shadow of the live model
+    python model_registry.py activate v0002
+    python model_registry.py compare v0001 v0002     # offline: both models over the cleaned listings
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from metrics import MODEL_SWAPS, SHADOW_DROPPED, SHADOW_LATENCY, SHADOW_PRICE_DIFF
+from model_artifact import export_artifact, load_artifact
+
+# predictor (and with it pandas and scipy) is imported where it is used, so
+# reading the pointers, as app.py does before its first render, needs only numpy
+
+REGISTRY_DIR = "models"
+PERFORMANCE_PATH = "model_performance.csv"
+ARTIFACT_NAME = "model.npz"
+METADATA_NAME = "metadata.json"
+ACTIVE = "ACTIVE"
+SHADOW = "SHADOW"
+POLL_INTERVAL = 2.0
+
+logger = logging.getLogger(__name__)
+
+
+def performance_row(model, performance_path=PERFORMANCE_PATH):
+    """The model_performance.csv row for a fitted sklearn estimator, or None.
+
+    A row matches on its display name ("Random Forest" for
+    RandomForestRegressor, spaces and case ignored) and on its Params
+    column: every hyperparameter train.py searched must equal the
+    estimator's own. A file without Params (the notebook's) cannot tell
+    two settings of a model apart, so it never matches.
+    """
+    if not performance_path or not os.path.exists(performance_path) or not hasattr(model, "get_params"):
+        return None
+    try:
+        params = model.get_params()
+    except AttributeError:
+        # Pickled by another sklearn version, missing attributes it now expects
+        return None
+    estimator = type(model).__name__.lower()
+    with open(performance_path, newline="") as f:
+        for row in csv.DictReader(f):
+            if not row.get("Params") or not estimator.startswith(row["Model"].replace(" ", "").lower()):
+                continue
+            if all(params.get(name, object()) == value for name, value in json.loads(row["Params"]).items()):
+                return {key: _number_or_text(value) for key, value in row.items()}
+    return None
+
+
+def _number_or_text(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _write_atomic(path, text):
+    handle, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=os.path.dirname(path))
+    with os.fdopen(handle, "w") as f:
+        f.write(text)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+
+    def exists(self):
+        return os.path.isfile(os.path.join(self.root, ACTIVE))
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if name.startswith("v") and name[1:].isdigit())
+
+    def artifact_path(self, version):
+        return os.path.join(self.root, version, ARTIFACT_NAME)
+
+    def metadata(self, version):
+        with open(os.path.join(self.root, version, METADATA_NAME)) as f:
+            return json.load(f)
+
+    def _pointer(self, name):
+        try:
+            with open(os.path.join(self.root, name)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def active_version(self):
+        return self._pointer(ACTIVE)
+
+    def shadow_version(self):
+        return self._pointer(SHADOW)
+
+    def _set_pointer(self, name, version):
+        if version is None:
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+            return
+        if version not in self.versions():
+            raise ValueError(f"unknown model version {version!r}")
+        _write_atomic(os.path.join(self.root, name), version + "\n")
+
+    def activate(self, version):
+        # A promoted shadow stops shadowing first, so no watcher ever sees it as both
+        if self.shadow_version() == version:
+            self._set_pointer(SHADOW, None)
+        self._set_pointer(ACTIVE, version)
+
+    def set_shadow(self, version):
+        """Score ``version`` in the shadow of the live model; None turns shadow mode off."""
+        if version is not None and version == self.active_version():
+            raise ValueError(f"{version} is already the active version")
+        self._set_pointer(SHADOW, version)
+
+    def register(self, model, feature_names, performance=None, source=None, activate=False):
+        """Store a fitted model as the next version; returns the version name.
+
+        ``performance`` is the model's model_performance.csv row (see
+        performance_row), kept in its metadata.
+        """
+        from predictor import model_fingerprint
+
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.root)
+        os.chmod(staging, 0o755)  # mkdtemp is owner-only; workers may run as other users
+        try:
+            artifact = os.path.join(staging, ARTIFACT_NAME)
+            if isinstance(model, str):
+                # Already an artifact: copied byte for byte, estimator name and all
+                shutil.copyfile(model, artifact)
+            else:
+                export_artifact(model, feature_names, artifact)
+            loaded, feature_names = load_artifact(artifact)
+            metadata = {
+                "estimator": loaded.estimator,
+                "kind": loaded.kind,
+                "n_features": len(feature_names),
+                "fingerprint": model_fingerprint(loaded, feature_names),
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "source": source,
+                "performance": performance,
+            }
+            while True:
+                versions = self.versions()
+                version = f"v{int(versions[-1][1:]) + 1 if versions else 1:04d}"
+                metadata["version"] = version
+                with open(os.path.join(staging, METADATA_NAME), "w") as f:
+                    json.dump(metadata, f, indent=2)
+                try:
+                    os.rename(staging, os.path.join(self.root, version))
+                    break
+                except OSError:
+                    if not os.path.isdir(os.path.join(self.root, version)):
+                        raise
+                    # Another process took this number first
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if activate or self.active_version() is None:
+            self.activate(version)
+        return version
+
+    def register_files(self, model_path, feature_names_path, performance_path=PERFORMANCE_PATH, activate=False):
+        from predictor import load_model_and_features
+
+        if str(model_path).endswith(".npz"):
+            # An artifact has no hyperparameters to find its row by
+            return self.register(model_path, None, None, model_path, activate)
+        model, feature_names = load_model_and_features(model_path, feature_names_path)
+        performance = performance_row(model, performance_path)
+        return self.register(model, feature_names, performance, model_path, activate)
+
+    def load(self, version, comparables=None):
+        from predictor import PricePredictor
+
+        predictor = PricePredictor.from_files(self.artifact_path(version), comparables=comparables)
+        predictor.version = version
+        return predictor
+
+
+class ShadowPredictor:
+    """Answers from the live predictor and mirrors each call to a candidate.
+
+    The candidate runs on one background thread; when more than
+    ``max_pending`` calls are waiting the newest is dropped, so a slow
+    candidate never holds up live traffic.
+    """
+
+    def __init__(self, live, candidate, max_pending=64):
+        self.live = live
+        self.candidate = candidate
+        self.max_pending = max_pending
+        self.calls = 0
+        self.rows = 0
+        self.dropped = 0
+        self.live_seconds = 0.0
+        self.candidate_seconds = 0.0
+        self.abs_diff_sum = 0.0
+        self.abs_diff_max = 0.0
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.live, name)
+
+    def _mirror(self, score, prices, live_seconds):
+        if not self._pending.acquire(blocking=False):
+            with self._lock:
+                self.dropped += 1
+            SHADOW_DROPPED.inc()
+            return
+        try:
+            self._executor.submit(self._compare, score, prices, live_seconds)
+        except RuntimeError:
+            # Closed by a swap while this request was in flight
+            self._pending.release()
+
+    def _compare(self, score, prices, live_seconds):
+        try:
+            start = time.perf_counter()
+            candidate_prices = np.atleast_1d(np.asarray(score(self.candidate), dtype=float))
+            candidate_seconds = time.perf_counter() - start
+            diff = np.abs(candidate_prices - prices)
+            SHADOW_LATENCY.observe(live_seconds, "live")
+            SHADOW_LATENCY.observe(candidate_seconds, "candidate")
+            SHADOW_PRICE_DIFF.labels().observe_many(diff.tolist())
+            with self._lock:
+                self.calls += 1
+                self.rows += len(diff)
+                self.live_seconds += live_seconds
+                self.candidate_seconds += candidate_seconds
+                self.abs_diff_sum += float(diff.sum())
+                self.abs_diff_max = max(self.abs_diff_max, float(diff.max(initial=0.0)))
+        except Exception:
+            logger.exception("shadow scoring with %s failed", getattr(self.candidate, "version", "candidate"))
+        finally:
+            self._pending.release()
+
+    def predict_batch(self, records):
+        start = time.perf_counter()
+        prices = self.live.predict_batch(records)
+        self._mirror(lambda predictor: predictor.predict_batch(records), prices, time.perf_counter() - start)
+        return prices
+
+    def predict_price(self, total_sqft, bath, balcony, bhk, location, area_type):
+        args = (total_sqft, bath, balcony, bhk, location, area_type)
+        start = time.perf_counter()
+        price = self.live.predict_price(*args)
+        self._mirror(lambda predictor: predictor.predict_price(*args), np.array([price]),
+                     time.perf_counter() - start)
+        return price
+
+    def stats(self):
+        with self._lock:
+            calls, rows = self.calls, self.rows
+            return {
+                "live": getattr(self.live, "version", None),
+                "candidate": getattr(self.candidate, "version", None),
+                "calls": calls, "rows": rows, "dropped": self.dropped,
+                "live_ms_per_call": self.live_seconds / calls * 1000 if calls else None,
+                "candidate_ms_per_call": self.candidate_seconds / calls * 1000 if calls else None,
+                "mean_abs_diff": self.abs_diff_sum / rows if rows else None,
+                "max_abs_diff": self.abs_diff_max,
+            }
+
+    def close(self):
+        # Finishes comparisons already queued; the caller is never blocked on them
+        self._executor.shutdown(wait=False)
+
+
+class ModelWatcher:
+    """Serves the registry's active version and swaps it when the pointer changes.
+
+    ``predictor`` is the current PricePredictor (or ShadowPredictor). Read it
+    once per request and use that reference throughout: a swap replaces the
+    attribute, never the object a request already holds. Attribute access
+    on the watcher itself is delegated to the current predictor, so it can
+    stand in for one (e.g. in prediction_service.py).
+
+    ``wrap``, if given, is applied to each live predictor before it is
+    served (app_resources.py puts it behind the prediction cache). In
+    shadow mode the wrapped predictor answers and the candidate is still
+    scored on every call, so live latencies include the wrapper's.
+    """
+
+    def __init__(self, registry, comparables=None, interval=POLL_INTERVAL, wrap=None):
+        self.registry = registry
+        self.comparables = comparables
+        self.interval = interval
+        self.wrap = wrap
+        self.swaps = 0
+        self._loaded = {}  # version -> PricePredictor, for the live and shadow versions
+        self._serving = (None, None)  # (live, shadow) versions behind self.predictor
+        self._failed = set()  # versions whose last load failed, logged once until they load
+        self._stop = threading.Event()
+        self.predictor = None
+        self.check()
+        if self.predictor is None:
+            raise ValueError(f"no loadable active model version in {registry.root}")
+
+    def __getattr__(self, name):
+        return getattr(self.predictor, name)
+
+    @property
+    def version(self):
+        return getattr(self.predictor, "version", None)
+
+    def _load(self, version):
+        """The predictor for ``version``, or None if it can't be loaded (retried on the next check)."""
+        predictor = self._loaded.get(version)
+        if predictor is not None:
+            return predictor
+        try:
+            predictor = self.registry.load(version, self.comparables)
+        except Exception:
+            if version not in self._failed:
+                self._failed.add(version)
+                MODEL_SWAPS.inc("failed")
+                logger.exception("could not load model version %s; retrying on later polls", version)
+            return None
+        self._failed.discard(version)
+        return predictor
+
+    def check(self):
+        """Swap in the current ACTIVE / SHADOW versions if they changed; True if swapped.
+
+        Live and shadow versions load independently: a shadow that fails to
+        load never holds up a new live version, and either is retried on the
+        next check until it loads or its pointer moves on.
+        """
+        active, shadow = self.registry.active_version(), self.registry.shadow_version()
+        if active is None:
+            return False
+        if shadow == active:
+            shadow = None
+        if (active, shadow) == self._serving:
+            return False
+        live = self._load(active)
+        if live is None:
+            # Keep serving the current model
+            return False
+        candidate = self._load(shadow) if shadow else None
+        serving = (active, shadow if candidate is not None else None)
+        if serving == self._serving:
+            return False
+        previous = self.predictor
+        self._loaded = {active: live, **({shadow: candidate} if candidate is not None else {})}
+        if self.wrap is not None:
+            live = self.wrap(live)
+        self.predictor = live if candidate is None else ShadowPredictor(live, candidate)
+        self._serving = serving
+        if isinstance(previous, ShadowPredictor):
+            previous.close()
+        if previous is not None:
+            self.swaps += 1
+            MODEL_SWAPS.inc("ok")
+            logger.info("now serving %s%s", active, f" (shadow {serving[1]})" if serving[1] else "")
+        return True
+
+    def _poll(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("model registry poll failed")
+
+    def start(self):
+        threading.Thread(target=self._poll, name="model-watcher", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def compare_versions(registry, live, candidate, records):
+    """Offline shadow comparison of two versions over the same records."""
+    predictors = {}
+    for name, version in (("live", live), ("candidate", candidate)):
+        predictor = registry.load(version)
+        predictor.predict_batch(records.iloc[:1])  # first-call overhead
+        start = time.perf_counter()
+        prices = predictor.predict_batch(records)
+        predictors[name] = (prices, time.perf_counter() - start)
+    diff = np.abs(predictors["candidate"][0] - predictors["live"][0])
+    return {
+        "rows": len(diff),
+        "live_ms": predictors["live"][1] * 1000,
+        "candidate_ms": predictors["candidate"][1] * 1000,
+        "mean_abs_diff": float(diff.mean()),
+        "p95_abs_diff": float(np.percentile(diff, 95)),
+        "max_abs_diff": float(diff.max()),
+    }
+
+
+def main(argv=None):
+    from predictor import FEATURE_NAMES_PATH, MODEL_PATH
+
+    parser = argparse.ArgumentParser(description="Manage the versioned model registry.")
+    parser.add_argument("--root", default=REGISTRY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    reg = sub.add_parser("register", help="add a model (.pkl + feature names, or .npz artifact) as a new version")
+    reg.add_argument("model", nargs="?", default=MODEL_PATH)
+    reg.add_argument("features", nargs="?", default=FEATURE_NAMES_PATH)
+    reg.add_argument("--performance", default=PERFORMANCE_PATH)
+    reg.add_argument("--activate", action="store_true")
+    sub.add_parser("list", help="show versions and their metrics")
+    act = sub.add_parser("activate", help="serve a version in every watching process")
+    act.add_argument("version")
+    sha = sub.add_parser("shadow", help="score a candidate version alongside the live one")
+    sha.add_argument("version", nargs="?", help="omit to turn shadow mode off")
+    cmp_ = sub.add_parser("compare", help="score two versions over the same listings")
+    cmp_.add_argument("live")
+    cmp_.add_argument("candidate")
+    cmp_.add_argument("--data", default="after_outlier_removal.csv")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.root)
+    if args.command == "register":
+        version = registry.register_files(args.model, args.features, args.performance, args.activate)
+        print(f"Registered {args.model} → {version}"
+              f"{' (active)' if registry.active_version() == version else ''}")
+    elif args.command == "list":
+        active, shadow = registry.active_version(), registry.shadow_version()
+        for version in registry.versions():
+            meta = registry.metadata(version)
+            perf = meta.get("performance") or {}
+            flag = "active" if version == active else "shadow" if version == shadow else ""
+            rmse = f"RMSE {perf['RMSE']:.3f}  R2 {perf['R2']:.4f}" if "RMSE" in perf else "no metrics"
+            print(f"{version}  {flag:<6}  {meta['estimator']:<26} {rmse}  {meta['created']}")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"Active → {args.version}")
+    elif args.command == "shadow":
+        registry.set_shadow(args.version)
+        print(f"Shadow → {args.version or 'off'}")
+    else:
+        import pandas as pd
+
+        from predictor import INPUT_COLUMNS
+
+        records = pd.read_csv(args.data)[INPUT_COLUMNS]
+        for key, value in compare_versions(registry, args.live, args.candidate, records).items():
+            print(f"{key:>14}: {value:,.4f}" if isinstance(value, float) else f"{key:>14}: {value:,}")
+
+
+if __name__ == "__main__":
+    main()
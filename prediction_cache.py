@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from metrics import CACHE_LOOKUPS
+from predictor import INPUT_COLUMNS
+
+
+class PredictionCache:
+    """Thread-safe LRU map from (model fingerprint, normalized inputs) to price.
+
+    One instance is shared by every session in the process. Keys carry the
+    predictor's fingerprint, so entries computed with a previous model can
+    never be returned after the model changes; they simply age out.
+    """
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                value = None
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+        CACHE_LOOKUPS.inc("miss" if value is None else "hit")
+        return value
+
+    def get_many(self, keys):
+        """Prices for many keys (None where missing), under one lock and one metrics update."""
+        values = []
+        with self._lock:
+            for key in keys:
+                value = self._data.get(key)
+                if value is not None:
+                    self._data.move_to_end(key)
+                values.append(value)
+            misses = values.count(None)
+            self.hits += len(values) - misses
+            self.misses += misses
+        if misses:
+            CACHE_LOOKUPS.inc("miss", amount=misses)
+        if misses < len(values):
+            CACHE_LOOKUPS.inc("hit", amount=len(values) - misses)
+        return values
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def put_many(self, items):
+        with self._lock:
+            for key, value in items:
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+
+def normalize_inputs(total_sqft, bath, balcony, bhk, location, area_type):
+    # Category strings are kept verbatim: PricePredictor matches them exactly,
+    # so " Whitefield" and "Whitefield" can price differently and must not share a key
+    return (float(total_sqft), float(bath), float(balcony), float(bhk), str(location), str(area_type))
+
+
+class CachedPredictor:
+    """PricePredictor front-end that memoizes prices in a PredictionCache."""
+
+    def __init__(self, predictor, cache):
+        self.predictor = predictor
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.predictor, name)
+
+    def _key(self, *inputs):
+        return (self.predictor.fingerprint,) + normalize_inputs(*inputs)
+
+    def predict_price(self, total_sqft, bath, balcony, bhk, location, area_type):
+        key = self._key(total_sqft, bath, balcony, bhk, location, area_type)
+        price = self.cache.get(key)
+        if price is None:
+            price = float(self.predictor.predict_price(*key[1:]))
+            self.cache.put(key, price)
+        return price
+
+    def predict_batch(self, records):
+        """Look every row up in the cache and score only the misses, in one batch."""
+        frame = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+        keys = [self._key(*row) for row in zip(*(frame[c].tolist() for c in INPUT_COLUMNS))]
+        prices = np.empty(len(keys))
+        missing = []
+        for i, price in enumerate(self.cache.get_many(keys)):
+            if price is None:
+                missing.append(i)
+            else:
+                prices[i] = price
+        if missing:
+            computed = self.predictor.predict_batch(
+                pd.DataFrame([keys[i][1:] for i in missing], columns=INPUT_COLUMNS))
+            prices[missing] = computed
+            self.cache.put_many(zip([keys[i] for i in missing], computed.tolist()))
+        return prices
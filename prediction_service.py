@@ -0,0 +1,338 @@
+"""Standalone HTTP prediction service with request micro-batching.
+
+Endpoints:
+    GET  /health         model and batching status
+    POST /predict        one record  -> {"price": ..., "location": ..., "location_confidence": ...}
+    POST /predict/batch  {"records": [...]} -> {"prices": [...], "locations": [...], "location_confidence": [...]}
+    POST /comparables    one record (+ optional "k") -> {"listings": [...]}
+    GET  /locations?q=   type-ahead: trained locations matching q -> {"locations": [...]}
+    GET  /metrics        latency histograms and counters, Prometheus text format (see metrics.py)
+
+Locations are free text: each is resolved onto a trained location (or
+"Other") by locations.LocationResolver, and the match is echoed back with
+its confidence.
+
+Concurrent requests are queued and scored together: a batch is closed when
+it reaches --max-batch records or --max-wait-ms after its first request,
+then scored with a single model call. Comparable listings are looked up
+directly in the per-location index (see comparables.py), which is built at
+startup unless --no-comparables is given.
+
+With --registry, the service serves the registry's active model version
+and picks up activations and shadow candidates without a restart (see
+model_registry.py); /health reports the version and shadow statistics.
+
+Example:
+    python prediction_service.py --port 8000 --max-batch 256 --max-wait-ms 2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+import metrics
+from comparables import DEFAULT_K, ComparablesIndex
+from model_registry import ModelRegistry, ModelWatcher
+from predictor import FEATURE_NAMES_PATH, INPUT_COLUMNS, MODEL_PATH, PricePredictor
+from preprocessing import AFTER_OUTLIERS_PATH
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+logger = logging.getLogger(__name__)
+
+
+class BadRequest(Exception):
+    pass
+
+
+class MicroBatcher:
+    """Collects records from concurrent callers and scores them in one pass."""
+
+    def __init__(self, predictor, max_batch=256, max_wait=0.002):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.records = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, records):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        return await future
+
+    async def _collect(self):
+        items = [await self._queue.get()]
+        size = len(items[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _score(self, records):
+        return self.predictor.predict_batch(pd.DataFrame.from_records(records, columns=INPUT_COLUMNS))
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+            records = [record for chunk, _ in items for record in chunk]
+            try:
+                # Score off the event loop so the next batch keeps filling
+                prices = await asyncio.to_thread(self._score, records)
+            except Exception as exc:
+                if len(items) == 1:
+                    _settle(items[0][1], exception=exc)
+                else:
+                    # Score each request on its own, so only the bad one gets the error
+                    for chunk, future in items:
+                        try:
+                            _settle(future, (await asyncio.to_thread(self._score, chunk)).tolist())
+                        except Exception as exc:
+                            _settle(future, exception=exc)
+                continue
+            self.batches += 1
+            self.records += len(records)
+            offset = 0
+            for chunk, future in items:
+                _settle(future, prices[offset:offset + len(chunk)].tolist())
+                offset += len(chunk)
+
+
+def _settle(future, result=None, exception=None):
+    # The caller may have gone away (cancelled) while its batch was scored
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+def _is_finite(number):
+    try:
+        return math.isfinite(number)
+    except OverflowError:
+        # An integer beyond float range
+        return False
+
+
+def validate_record(record):
+    if not isinstance(record, dict):
+        raise BadRequest("each record must be a JSON object")
+    missing = [c for c in INPUT_COLUMNS if c not in record]
+    if missing:
+        raise BadRequest(f"missing fields: {missing}")
+    clean = {}
+    for column in INPUT_COLUMNS:
+        value = record[column]
+        if column in ("location", "area_type"):
+            if not isinstance(value, str):
+                raise BadRequest(f"{column} must be a string")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise BadRequest(f"{column} must be a number")
+        elif not _is_finite(value):
+            # NaN and Infinity parse from JSON, but can't be priced or answered in valid JSON
+            raise BadRequest(f"{column} must be a finite number")
+        clean[column] = value
+    return clean
+
+
+class PredictionService:
+    def __init__(self, predictor, max_batch=256, max_wait=0.002):
+        self.predictor = predictor
+        self.batcher = MicroBatcher(predictor, max_batch, max_wait)
+        self.started = time.time()
+
+    async def handle(self, method, path, body, query=""):
+        if path == "/metrics":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, metrics.REGISTRY.render()
+        if path == "/locations":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            params = parse_qs(query)
+            try:
+                limit = int(params.get("limit", ["10"])[0])
+            except ValueError:
+                raise BadRequest("limit must be an integer")
+            return 200, {"locations": self.predictor.location_resolver.search(params.get("q", [""])[0], limit)}
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            shadow_stats = getattr(self.predictor, "stats", None)
+            return 200, {
+                "status": "ok",
+                "model": type(self.predictor.model).__name__,
+                "model_version": self.predictor.version,
+                "shadow": shadow_stats() if shadow_stats else None,
+                "n_features": self.predictor.n_features,
+                "uptime_s": round(time.time() - self.started, 3),
+                "batches": self.batcher.batches,
+                "records": self.batcher.records,
+            }
+        if path not in ("/predict", "/predict/batch", "/comparables"):
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise BadRequest("body is not valid JSON")
+        if path == "/comparables":
+            return 200, {"listings": self.comparables(payload)}
+        if path == "/predict":
+            record = validate_record(payload)
+            record["location"], confidence = self.predictor.location_resolver.resolve_one(record["location"])
+            metrics.PREDICTIONS_PER_REQUEST.observe(1, "api")
+            with metrics.PREDICTION_LATENCY.time("single"):
+                price = (await self.batcher.submit([record]))[0]
+            return 200, {"price": price, "location": record["location"], "location_confidence": confidence}
+        records = payload.get("records") if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            raise BadRequest('expected {"records": [...]}')
+        records = [validate_record(r) for r in records]
+        metrics.PREDICTIONS_PER_REQUEST.observe(len(records), "api")
+        locations, confidence = self.predictor.location_resolver.resolve([r["location"] for r in records])
+        for record, location in zip(records, locations):
+            record["location"] = location
+        prices = await self.batcher.submit(records) if records else []
+        return 200, {"prices": prices, "locations": locations.tolist(), "location_confidence": confidence.tolist()}
+
+    def comparables(self, payload):
+        if self.predictor.comparables is None:
+            raise BadRequest("comparable listings are not enabled on this service")
+        record = validate_record(payload)
+        location, _ = self.predictor.location_resolver.resolve_one(record["location"])
+        k = payload.get("k", DEFAULT_K)
+        if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+            raise BadRequest("k must be a positive integer")
+        # Sub-millisecond lookup, answered inline rather than through the batcher
+        return self.predictor.comparables.query_records(
+            location, record["total_sqft"], record["bhk"], record["bath"], record["area_type"], k)
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = headers.get("content-length") or "0"
+                if not (length.isascii() and length.isdigit()):
+                    # Without a usable length the rest of the stream can't be framed
+                    status, payload = 400, {"error": "invalid Content-Length"}
+                    keep_alive = False
+                elif int(length) > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "body too large"}
+                    keep_alive = False
+                else:
+                    length = int(length)
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        path, _, query = target.partition("?")
+                        status, payload = await self.handle(method, path, body, query)
+                    except BadRequest as exc:
+                        status, payload = 400, {"error": str(exc)}
+                    except Exception:
+                        logger.exception("%s %s failed", method, target)
+                        status, payload = 500, {"error": "internal server error"}
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+                # Everything is JSON except the plain-text /metrics page
+                if isinstance(payload, str):
+                    data, content_type = payload.encode(), metrics.CONTENT_TYPE
+                else:
+                    data, content_type = json.dumps(payload).encode(), "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def run(self, host="127.0.0.1", port=8000):
+        self.batcher.start()
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        print(f"Serving predictions on http://{host}:{port} "
+              f"(max_batch={self.batcher.max_batch}, max_wait={self.batcher.max_wait * 1000:g}ms)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the house price prediction HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=256, help="max records per model call")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="max time a batch stays open")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--features", default=FEATURE_NAMES_PATH)
+    parser.add_argument("--listings", default=AFTER_OUTLIERS_PATH, help="cleaned listings for /comparables")
+    parser.add_argument("--no-comparables", action="store_true", help="skip building the comparables index")
+    parser.add_argument("--registry", help="serve the active version of this model registry, hot-swapping "
+                                           "on changes (overrides --model/--features)")
+    args = parser.parse_args(argv)
+
+    comparables = None if args.no_comparables else ComparablesIndex.from_csv(args.listings)
+    if args.registry:
+        # Stands in for a PricePredictor, always delegating to the registry's live version
+        predictor = ModelWatcher(ModelRegistry(args.registry), comparables).start()
+    else:
+        predictor = PricePredictor.from_files(args.model, args.features, comparables=comparables)
+    service = PredictionService(predictor, args.max_batch, args.max_wait_ms / 1000)
+    try:
+        asyncio.run(service.run(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import hashlib
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import FeatureEncoder
+from locations import LocationResolver
+from metrics import PREDICTION_LATENCY, STAGE_LATENCY, UNKNOWN_LOCATIONS
+from model_artifact import LinearArtifactModel, load_artifact
+
+# predict_price is not timed here: at ~2 us a call, timing it would cost as
+# much again. Callers time single predictions at the request boundary.
+_BATCH_LATENCY = PREDICTION_LATENCY.labels("batch")
+_ENCODE_LATENCY = STAGE_LATENCY.labels("encode")
+_PREDICT_LATENCY = STAGE_LATENCY.labels("predict")
+
+MODEL_PATH = "best_model.pkl"
+FEATURE_NAMES_PATH = "feature_names.pkl"
+
+# Raw input columns expected by the predictor (same order as predict_price)
+NUMERIC_FEATURES = ["total_sqft", "bath", "balcony", "bhk"]
+CATEGORICAL_FEATURES = ["location", "area_type"]
+INPUT_COLUMNS = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+
+def load_model_and_features(model_path=MODEL_PATH, feature_names_path=FEATURE_NAMES_PATH):
+    if str(model_path).endswith(".npz"):
+        # Pickle-free artifact; it carries its own feature_names
+        return load_artifact(model_path)
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    with open(feature_names_path, "rb") as f:
+        feature_names = pickle.load(f)
+    return model, list(feature_names)
+
+
+def model_fingerprint(model, feature_names):
+    """Content hash identifying a model + feature layout, used to key caches.
+
+    Linear models hash their parameters, so the same weights give the same
+    fingerprint whether loaded from a pickle or a model artifact.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\n".join(feature_names).encode())
+    if is_linear_model(model):
+        digest.update(np.ascontiguousarray(model.coef_, dtype=np.float64).tobytes())
+        digest.update(np.float64(model.intercept_).tobytes())
+    else:
+        digest.update(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+def is_linear_model(model):
+    """True for fitted linear models (sklearn or artifact) with a single coefficient vector."""
+    if isinstance(model, LinearArtifactModel):
+        return True
+    coef = getattr(model, "coef_", None)
+    return (type(model).__module__.startswith("sklearn.linear_model")
+            and coef is not None and np.ndim(coef) == 1)
+
+
+class PricePredictor:
+    """Encodes raw property records into the one-hot layout of feature_names
+    and scores them with the trained model.
+
+    The name -> column index is built once, so encoding a batch never scans
+    feature_names; non-linear models are fed the sparse one-hot matrix from
+    FeatureEncoder. For linear models prices are computed directly as
+    intercept + numeric @ coef + coef[location] + coef[area_type] without
+    materialising the one-hot matrix at all.
+    """
+
+    def __init__(self, model, feature_names, comparables=None):
+        self.model = model
+        # Registry version this model was loaded from (model_registry.py), if any
+        self.version = None
+        # Optional comparables.ComparablesIndex backing comparable_listings()
+        self.comparables = comparables
+        self.encoder = FeatureEncoder(feature_names)
+        self.feature_names = self.encoder.feature_names
+        self.column_index = self.encoder.column_index
+        self.numeric_columns = np.array([self.column_index[c] for c in NUMERIC_FEATURES])
+        self.fingerprint = model_fingerprint(model, self.feature_names)
+        # Maps free-text locations onto trained ones; predict_* still expect exact names
+        self.location_resolver = LocationResolver.from_feature_names(self.feature_names)
+        # Known, but encoded as all zeros like an unseen location
+        self.reference_location = self.location_resolver.reference
+        self.linear = is_linear_model(model)
+        if self.linear:
+            self.intercept = float(model.intercept_)
+            # Not copied: for an artifact this is a view of the memory-mapped
+            # weights, shared by every worker on the host. Category indices
+            # are -1 for unseen values, which must contribute nothing.
+            self.coef = np.asarray(model.coef_, dtype=float)
+            self.numeric_coef = self.coef[self.numeric_columns]  # the four numeric weights
+
+    @classmethod
+    def from_files(cls, model_path=MODEL_PATH, feature_names_path=FEATURE_NAMES_PATH, comparables=None):
+        return cls(*load_model_and_features(model_path, feature_names_path), comparables=comparables)
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def categories(self, column):
+        """Sorted category values seen in training for a raw column."""
+        prefix = f"{column}_"
+        return sorted(name[len(prefix):] for name in self.feature_names if name.startswith(prefix))
+
+    def category_indices(self, column, values):
+        """Map raw category values to feature columns, -1 where unseen."""
+        return self.encoder.category_indices(column, values)
+
+    def _as_frame(self, records):
+        if isinstance(records, pd.DataFrame):
+            frame = records
+        else:
+            frame = pd.DataFrame(records)
+        missing = [c for c in INPUT_COLUMNS if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Missing input columns: {missing}")
+        return frame
+
+    def encode(self, records):
+        """Sparse (CSR) one-hot feature matrix for a batch, columns ordered as feature_names."""
+        return self.encoder.transform(self._as_frame(records)[INPUT_COLUMNS])
+
+    def predict_batch(self, records):
+        """Predict prices (in lakhs) for a DataFrame or list of records in one pass."""
+        start = time.perf_counter()
+        frame = self._as_frame(records)
+        if len(frame) == 0:
+            return np.empty(0)
+        prices = self._predict_frame(frame)
+        _BATCH_LATENCY.observe(time.perf_counter() - start)
+        return prices
+
+    def _count_unknown(self, locations, indices):
+        unseen = indices < 0
+        if self.reference_location is not None and unseen.any():
+            unseen[unseen] = locations[unseen] != self.reference_location
+        return int(np.count_nonzero(unseen))
+
+    def _predict_frame(self, frame):
+        start = time.perf_counter()
+        locations = frame["location"].to_numpy()
+        if not self.linear:
+            X = self.encode(frame)
+            unknown = self._count_unknown(locations, self.category_indices("location", locations))
+            encoded = time.perf_counter()
+            prices = np.asarray(self.model.predict(X), dtype=float)
+        else:
+            numeric = frame[NUMERIC_FEATURES].to_numpy(dtype=float)
+            indices = {column: self.category_indices(column, frame[column].to_numpy())
+                       for column in CATEGORICAL_FEATURES}
+            unknown = self._count_unknown(locations, indices["location"])
+            encoded = time.perf_counter()
+            prices = numeric @ self.numeric_coef + self.intercept
+            for column in CATEGORICAL_FEATURES:
+                index = indices[column]
+                prices += np.where(index >= 0, self.coef[index], 0.0)
+        done = time.perf_counter()
+        _ENCODE_LATENCY.observe(encoded - start)
+        _PREDICT_LATENCY.observe(done - encoded)
+        if unknown:
+            UNKNOWN_LOCATIONS.inc(amount=unknown)
+        return prices
+
+    def predict_price(self, total_sqft, bath, balcony, bhk, location, area_type):
+        if self.linear:
+            coef = self.coef
+            location_index = self.column_index.get(f"location_{location}", -1)
+            if location_index < 0 and location != self.reference_location:
+                UNKNOWN_LOCATIONS.inc()
+            area_type_index = self.column_index.get(f"area_type_{area_type}", -1)
+            price = (self.intercept
+                     + float(np.dot(self.numeric_coef, (total_sqft, bath, balcony, bhk)))
+                     + (coef[location_index] if location_index >= 0 else 0.0)
+                     + (coef[area_type_index] if area_type_index >= 0 else 0.0))
+        else:
+            price = float(self._predict_frame(pd.DataFrame([{
+                "total_sqft": total_sqft, "bath": bath, "balcony": balcony, "bhk": bhk,
+                "location": location, "area_type": area_type,
+            }]))[0])
+        return price
+
+    def comparable_listings(self, total_sqft, bath, bhk, location, area_type, k=5):
+        """The k most similar actual listings in ``location`` (DataFrame with a distance column)."""
+        if self.comparables is None:
+            raise ValueError("no comparables index attached to this predictor")
+        return self.comparables.query(location, total_sqft, bhk, bath, area_type, k)
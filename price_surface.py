@@ -0,0 +1,159 @@
+"""Precomputed price grids behind the app's BHK comparison and area charts.
+
+For every location x area_type in feature_names, and every bath/balcony/bhk
+value the sidebar allows, the chart grids are scored once and stored in a
+compressed .npz. The app then serves both charts by array indexing.
+
+Build (or rebuild after retraining) with:
+    python price_surface.py
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from predictor import FEATURE_NAMES_PATH, MODEL_PATH, PricePredictor
+
+SURFACE_PATH = "price_surface.npz"
+
+# Chart grids used by app.py
+BHK_OPTIONS = np.arange(1, 6)
+BASE_AREA_PER_BHK = 600
+AREA_SWEEP = np.linspace(500, 3000, 10)
+
+# Sidebar input domains
+BATH_OPTIONS = np.arange(1, 11)
+BALCONY_OPTIONS = np.arange(0, 6)
+BHK_RANGE = np.arange(1, 11)
+
+# Prices are stored as integer hundredths of a lakh (the charts show 2
+# decimals), delta-encoded along the area sweep so the file compresses well
+PRICE_SCALE = 100
+
+
+def _grid_frame(locations, area_types, bath, balcony, bhk, total_sqft):
+    """Cartesian product of the given axes as a predictor input frame (C order)."""
+    axes = np.meshgrid(np.arange(len(locations)), np.arange(len(area_types)),
+                       bath, balcony, bhk, total_sqft, indexing="ij")
+    loc, area, bath, balcony, bhk, sqft = (a.ravel() for a in axes)
+    return pd.DataFrame({
+        "total_sqft": sqft, "bath": bath, "balcony": balcony, "bhk": bhk,
+        "location": np.asarray(locations, dtype=object)[loc],
+        "area_type": np.asarray(area_types, dtype=object)[area],
+    })
+
+
+def build_price_surface(predictor):
+    locations = predictor.categories("location")
+    area_types = predictor.categories("area_type")
+    L, A = len(locations), len(area_types)
+    nb, nc = len(BATH_OPTIONS), len(BALCONY_OPTIONS)
+
+    # BHK comparison: b bedrooms at 600*b sq.ft with min(b, bath) bathrooms
+    bhk_prices = np.empty((L, A, nb, nc, len(BHK_OPTIONS)), dtype=np.float32)
+    for j, b in enumerate(BHK_OPTIONS):
+        frame = _grid_frame(locations, area_types, np.minimum(b, BATH_OPTIONS), BALCONY_OPTIONS,
+                            [b], [BASE_AREA_PER_BHK * b])
+        bhk_prices[..., j] = predictor.predict_batch(frame).reshape(L, A, nb, nc)
+
+    # Area trend: selected bhk/bath/balcony over the 500-3000 sq.ft sweep
+    area_prices = np.empty((L, A, nb, nc, len(BHK_RANGE), len(AREA_SWEEP)), dtype=np.float32)
+    for i, location in enumerate(locations):
+        frame = _grid_frame([location], area_types, BATH_OPTIONS, BALCONY_OPTIONS, BHK_RANGE, AREA_SWEEP)
+        area_prices[i] = predictor.predict_batch(frame).reshape(area_prices.shape[1:])
+
+    surface = {
+        "fingerprint": np.array(predictor.fingerprint),
+        "locations": np.array(locations, dtype=str),
+        "area_types": np.array(area_types, dtype=str),
+        "bhk_prices": bhk_prices,
+        "area_prices": area_prices,
+    }
+    if predictor.linear:
+        surface["sqft_coef"] = np.array(predictor.numeric_coef[0])
+    return surface
+
+
+def _quantize(prices):
+    return np.round(prices.astype(np.float64) * PRICE_SCALE).astype(np.int32)
+
+
+def save_price_surface(surface, path=SURFACE_PATH):
+    arrays = dict(surface)
+    arrays["bhk_prices"] = _quantize(surface["bhk_prices"])
+    area = _quantize(surface["area_prices"])
+    arrays["area_prices"] = np.concatenate([area[..., :1], np.diff(area, axis=-1)], axis=-1)
+    np.savez_compressed(path, **arrays)
+
+
+class PriceSurface:
+    """Index-based access to a saved price surface."""
+
+    def __init__(self, arrays):
+        self.fingerprint = str(arrays["fingerprint"])
+        self.location_index = {name: i for i, name in enumerate(arrays["locations"].tolist())}
+        self.area_type_index = {name: i for i, name in enumerate(arrays["area_types"].tolist())}
+        self.bhk_prices = arrays["bhk_prices"]
+        self.area_prices = arrays["area_prices"]
+        self.sqft_coef = float(arrays["sqft_coef"]) if "sqft_coef" in arrays else None
+
+    @classmethod
+    def load(cls, path=SURFACE_PATH):
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        arrays["bhk_prices"] = arrays["bhk_prices"].astype(np.float32) / PRICE_SCALE
+        arrays["area_prices"] = np.cumsum(arrays["area_prices"], axis=-1).astype(np.float32) / PRICE_SCALE
+        return cls(arrays)
+
+    def _cell(self, location, area_type, bath, balcony):
+        try:
+            idx = (self.location_index[location], self.area_type_index[area_type],
+                   int(bath) - BATH_OPTIONS[0], int(balcony) - BALCONY_OPTIONS[0])
+        except KeyError:
+            return None
+        if (bath != int(bath) or balcony != int(balcony)
+                or not 0 <= idx[2] < len(BATH_OPTIONS) or not 0 <= idx[3] < len(BALCONY_OPTIONS)):
+            return None
+        return idx
+
+    def bhk_comparison(self, location, area_type, bath, balcony):
+        """Prices for BHK_OPTIONS at 600 sq.ft per bedroom, or None if off-grid."""
+        idx = self._cell(location, area_type, bath, balcony)
+        return None if idx is None else self.bhk_prices[idx].astype(float)
+
+    def area_trend(self, location, area_type, bath, balcony, bhk, areas=None):
+        """Prices over AREA_SWEEP (or arbitrary ``areas``), or None if off-grid.
+
+        Arbitrary sweeps need the surface of a linear model, where price is
+        affine in total_sqft and can be evaluated in closed form from the
+        first grid point.
+        """
+        idx = self._cell(location, area_type, bath, balcony)
+        j = int(bhk) - BHK_RANGE[0]
+        if idx is None or bhk != int(bhk) or not 0 <= j < len(BHK_RANGE):
+            return None
+        grid = self.area_prices[idx + (j,)].astype(float)
+        if areas is None:
+            return grid
+        if self.sqft_coef is None:
+            raise ValueError("arbitrary area sweeps require a linear-model surface")
+        return grid[0] + self.sqft_coef * (np.asarray(areas, dtype=float) - AREA_SWEEP[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute chart price surfaces for the app.")
+    parser.add_argument("--output", default=SURFACE_PATH)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--features", default=FEATURE_NAMES_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    surface = build_price_surface(PricePredictor.from_files(args.model, args.features))
+    save_price_surface(surface, args.output)
+    cells = surface["bhk_prices"].size + surface["area_prices"].size
+    print(f"Saved {cells:,} prices → {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import os
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def predictor():
+    from predictor import PricePredictor
+
+    return PricePredictor.from_files(os.path.join(REPO_DIR, "best_model.npz"))
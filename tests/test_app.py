@@ -0,0 +1,20 @@
+import os
+
+from benchmarks.bench_app import INPUT_FRAGMENT, _fragment_id, _timed_run
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_overview_follows_inputs_without_a_page_rerun(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.chdir(REPO_DIR)
+    at = AppTest.from_file(os.path.join(REPO_DIR, "app.py"), default_timeout=120)
+    _timed_run(at)
+    assert at.metric[0].value == "1,000 sq.ft"
+    at.slider[0].set_value(1500)
+    at.number_input[0].set_value(3)
+    _timed_run(at, _fragment_id(at, INPUT_FRAGMENT))
+    values = [metric.value for metric in at.metric]
+    assert values[:4] == ["1,500 sq.ft", "2 BHK", "3", "1"]
+    assert len(values) == 4
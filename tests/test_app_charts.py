@@ -0,0 +1,26 @@
+import numpy as np
+
+from app_charts import area_trend_figure, bhk_comparison_figure
+from price_surface import AREA_SWEEP, BHK_OPTIONS
+
+INPUTS = ("Whitefield", "Super built-up  Area", 2, 1, 2)
+
+
+def test_each_call_gets_its_own_figure(predictor):
+    for build in (bhk_comparison_figure, area_trend_figure):
+        first = build(predictor.fingerprint, *INPUTS, predictor, None)
+        first.data[0].y = [0.0] * len(first.data[0].y)
+        first.update_layout(title_text="changed")
+        second = build(predictor.fingerprint, *INPUTS, predictor, None)
+        assert second is not first
+        assert min(second.data[0].y) > 0
+        assert second.layout.title.text != "changed"
+
+
+def test_figures_plot_model_prices(predictor):
+    location, area_type, bath, balcony, bhk = INPUTS
+    trend = area_trend_figure(predictor.fingerprint, *INPUTS, predictor, None)
+    expected = [predictor.predict_price(sqft, bath, balcony, bhk, location, area_type) for sqft in AREA_SWEEP]
+    np.testing.assert_allclose(trend.data[0].y, expected)
+    bars = bhk_comparison_figure(predictor.fingerprint, *INPUTS, predictor, None)
+    assert len(bars.data[0].y) == len(BHK_OPTIONS)
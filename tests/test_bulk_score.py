@@ -0,0 +1,32 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bulk_score import PREDICTION_COLUMN, bulk_score
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(REPO_DIR, "best_model.npz")
+
+
+def test_columns_missing_from_the_first_chunk_keep_their_type(tmp_path):
+    raw = pd.read_csv(os.path.join(REPO_DIR, "bengaluru_house_prices.csv"), nrows=300)
+    # All missing in the first chunk, so a schema inferred from it would type them as null
+    raw.loc[:99, ["society", "balcony"]] = np.nan
+    raw.to_csv(tmp_path / "listings.csv", index=False)
+    raw.to_parquet(tmp_path / "listings.parquet")
+    scored = {}
+    for source in ("listings.csv", "listings.parquet"):
+        for target in ("scored.csv", "scored.parquet"):
+            output = str(tmp_path / target)
+            rows, _ = bulk_score(str(tmp_path / source), output, chunksize=100, workers=1, model_path=MODEL_PATH)
+            assert rows == len(raw)
+            scored[source, target] = (pq.read_table(output).to_pandas() if target.endswith(".parquet")
+                                      else pd.read_csv(output))
+    table = pq.read_table(tmp_path / "scored.parquet")
+    assert table.schema.field("society").type != pa.null()
+    expected = scored["listings.csv", "scored.csv"][PREDICTION_COLUMN]
+    for frame in scored.values():
+        np.testing.assert_allclose(frame[PREDICTION_COLUMN], expected)
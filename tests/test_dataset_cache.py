@@ -0,0 +1,32 @@
+import os
+
+import pandas as pd
+
+from dataset_cache import cache_path_for, convert_dataset, load_dataset
+
+
+def test_same_named_files_get_separate_caches(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    paths = []
+    for folder, price in (("a", 10.0), ("b", 20.0)):
+        os.makedirs(tmp_path / folder)
+        path = str(tmp_path / folder / "listings.csv")
+        pd.DataFrame({"location": ["Whitefield"], "price": [price]}).to_csv(path, index=False)
+        paths.append(path)
+
+    assert cache_path_for(paths[0], cache_dir) != cache_path_for(paths[1], cache_dir)
+    assert [load_dataset(path, cache_dir=cache_dir)["price"].iloc[0] for path in paths] == [10.0, 20.0]
+    # Reloads come from the cache and still don't mix the files up
+    assert [load_dataset(path, cache_dir=cache_dir)["price"].iloc[0] for path in paths] == [10.0, 20.0]
+
+
+def test_convert_leaves_no_temp_files(tmp_path):
+    path = str(tmp_path / "after_outlier_removal.csv")
+    pd.DataFrame({"location": ["b", "a", "b"], "bhk": [2, 3, 2], "price": [1.0, 2.0, 3.0]}).to_csv(path, index=False)
+    cache_dir = str(tmp_path / "cache")
+    target = convert_dataset(path, cache_dir)
+    assert os.listdir(cache_dir) == [os.path.basename(target)]
+
+    df = load_dataset(path, cache_dir=cache_dir)
+    assert list(df["location"].cat.categories) == ["a", "b"]
+    assert df["bhk"].dtype == "int16"
@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+from sklearn.linear_model import LinearRegression
+
+from features import FeatureEncoder
+from incremental import (
+    IncrementalModel, RegressionStats, _merge_moments, _moments, _training_frame, write_model)
+from predictor import PricePredictor
+from preprocessing import RARE_LOCATION_THRESHOLD, run_pipeline
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_PATH = os.path.join(REPO_DIR, "bengaluru_house_prices.csv")
+NEW_LOCATION = "Zz Test Nagar"
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return pd.read_csv(RAW_PATH)
+
+
+@pytest.fixture
+def state(raw):
+    return IncrementalModel.from_raw(raw)
+
+
+def new_listings(raw, count, location=NEW_LOCATION):
+    """``count`` copies of a complete raw listing at a new location, prices spread around it."""
+    row = raw.dropna(subset=["location", "size", "bath", "total_sqft", "price"]).iloc[[0]]
+    batch = pd.concat([row] * count, ignore_index=True)
+    batch["location"] = location
+    batch["total_sqft"] = "1200"
+    batch["price"] = np.linspace(60.0, 80.0, count)
+    return batch
+
+
+def test_batched_statistics_match_a_full_fit():
+    rng = np.random.default_rng(0)
+    X = sp.random(500, 12, density=0.3, format="csr", random_state=1)
+    y = X @ rng.normal(size=12) + 3.0 + rng.normal(scale=0.1, size=500)
+    stats = RegressionStats(12)
+    bounds = [0, 7, 200, 350, 500]
+    for start, end in zip(bounds, bounds[1:]):
+        stats.update(X[start:end], y[start:end])
+    coef, intercept, _, _, rmse = stats.solve()
+    full = LinearRegression().fit(X.toarray(), y)
+    np.testing.assert_allclose(coef, full.coef_, atol=1e-8)
+    assert intercept == pytest.approx(full.intercept_)
+    assert rmse == pytest.approx(np.sqrt(np.mean((full.predict(X.toarray()) - y) ** 2)))
+
+
+def test_merged_moments_match_moments_of_the_union():
+    rng = np.random.default_rng(2)
+    frame = pd.DataFrame({"key": rng.choice(list("abcd"), 300), "value": rng.normal(size=300)})
+    merged = _merge_moments(_moments(frame["value"][:120], frame["key"][:120]),
+                            _moments(frame["value"][120:], frame["key"][120:]))
+    expected = _moments(frame["value"], frame["key"])
+    pd.testing.assert_frame_equal(merged.sort_index()[["count", "mean", "m2"]],
+                                  expected.sort_index()[["count", "mean", "m2"]],
+                                  check_dtype=False, check_names=False)
+
+
+def test_initial_state_matches_a_full_refit(raw, state):
+    frame = _training_frame(run_pipeline(raw))
+    encoder = FeatureEncoder.fit(frame)
+    assert state.feature_names == encoder.feature_names
+    assert state.regression.n == len(frame)
+    X = encoder.transform(frame)
+    # Dense: sklearn fits sparse input with an iterative solver, far less exact
+    full = LinearRegression().fit(X.toarray(), frame["price"].to_numpy(dtype=float))
+    model, _ = state.to_linear_regression()
+    np.testing.assert_allclose(model.predict(X), full.predict(X.toarray()), atol=1e-6)
+
+
+def test_new_location_is_promoted_at_the_threshold(raw, state):
+    n_features, n_rows = len(state.feature_names), state.regression.n
+    summary = state.update(new_listings(raw, RARE_LOCATION_THRESHOLD - 1))
+    assert summary["promoted"] == []
+    assert state.pending[NEW_LOCATION] == RARE_LOCATION_THRESHOLD - 1
+    assert len(state.feature_names) == n_features
+    summary = state.update(new_listings(raw, 1))
+    assert summary["promoted"] == [NEW_LOCATION]
+    assert NEW_LOCATION not in state.pending
+    assert state.feature_names[-1] == f"location_{NEW_LOCATION}"
+    assert state.regression.n_features == n_features + 1
+    assert state.regression.n == n_rows + summary["kept"]
+
+
+def test_save_load_round_trip(raw, state, tmp_path):
+    state.update(new_listings(raw, 4))
+    path = str(tmp_path / "model_state.npz")
+    state.save(path)
+    loaded = IncrementalModel.load(path)
+    assert loaded.feature_names == state.feature_names
+    assert loaded.categories == state.categories
+    assert loaded.pending == state.pending
+    for a, b in zip(loaded.pps_stats, state.pps_stats):
+        np.testing.assert_allclose(a.to_numpy(), b.to_numpy())
+    np.testing.assert_allclose(loaded.bhk_stats.to_numpy(), state.bhk_stats.to_numpy())
+    np.testing.assert_allclose(loaded.to_linear_regression()[0].coef_, state.to_linear_regression()[0].coef_)
+    # The reloaded state keeps folding in batches like the original
+    for model in (state, loaded):
+        model.update(new_listings(raw, RARE_LOCATION_THRESHOLD))
+    np.testing.assert_allclose(loaded.to_linear_regression()[0].coef_, state.to_linear_regression()[0].coef_)
+
+
+def test_write_model_replaces_files_whole(state, tmp_path):
+    write_model(state, str(tmp_path))
+    write_model(state, str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["best_model.npz", "best_model.pkl", "feature_names.pkl"]
+    pickled = PricePredictor.from_files(str(tmp_path / "best_model.pkl"), str(tmp_path / "feature_names.pkl"))
+    artifact = PricePredictor.from_files(str(tmp_path / "best_model.npz"))
+    assert pickled.fingerprint == artifact.fingerprint
@@ -0,0 +1,85 @@
+import pytest
+
+import metrics
+from locations import LocationResolver, edit_distance
+
+
+@pytest.fixture(scope="module")
+def resolver(predictor):
+    return predictor.location_resolver
+
+
+@pytest.mark.parametrize("text", [
+    "Adugodi", "Devarabeesana Halli", " Devarabeesana Halli", "Dhanalakshmi Layout", "Doddakammanahalli",
+    "Kumbena Agrahara", "Koramangala 5th block", "whitefiled",
+])
+def test_names_training_grouped_as_other_stay_other(resolver, text):
+    assert resolver.resolve_one(text) == ("Other", 0.0)
+
+
+@pytest.mark.parametrize("text, location", [
+    ("Adugodi", "Other"),
+    ("Doddakammanahalli", "Other"),
+    ("Devarabeesana Halli", "Other"),
+    ("whitefeild", "Whitefield"),
+    ("Whitefeild", "Whitefield"),
+])
+def test_containment_is_not_a_misspelling(predictor, text, location):
+    # Without the raw "Other" names, the edit checks alone must keep these apart
+    resolver = LocationResolver.from_feature_names(predictor.feature_names, other_locations=[])
+    assert resolver.resolve_one(text)[0] == location
+
+
+@pytest.mark.parametrize("text, location", [
+    ("Whitefield", "Whitefield"),
+    ("electronic city phase 2", "Electronic City Phase II"),
+    ("JP Nagar 7th phase", "7th Phase JP Nagar"),
+    ("koramangala 1st block", "1st Block Koramangala"),
+])
+def test_exact_and_reordered_matches(resolver, text, location):
+    assert resolver.resolve_one(text) == (location, 1.0)
+
+
+@pytest.mark.parametrize("text, location, confidence", [
+    ("whitefeild", "Whitefield", 0.9),
+    ("Electronic ctiy phase II", "Electronic City Phase II", 0.95),
+    ("Hebal", "Hebbal", 0.8333),
+])
+def test_misspellings(resolver, text, location, confidence):
+    assert resolver.resolve_one(text) == (location, confidence)
+
+
+@pytest.mark.parametrize("text", [" Devarachikkanahalli", "Devarachikkanahalli", "devarachikkanahalli "])
+def test_reference_location_is_known(predictor, resolver, text):
+    # Dropped by drop_first, so it has no feature column, but it was trained on
+    assert "location_ Devarachikkanahalli" not in predictor.feature_names
+    location, confidence = resolver.resolve_one(text)
+    assert (location, confidence) == (" Devarachikkanahalli", 1.0)
+    before = metrics.UNKNOWN_LOCATIONS.value()
+    price = predictor.predict_price(1200, 2, 1, 2, location, "Super built-up  Area")
+    assert metrics.UNKNOWN_LOCATIONS.value() == before
+    assert price == pytest.approx(52.7644, abs=1e-4)
+    assert price != pytest.approx(predictor.predict_price(1200, 2, 1, 2, "Other", "Super built-up  Area"))
+
+
+def test_numbers_must_match(resolver):
+    assert resolver.resolve_one("9th Phase JP Nagra")[0] == "9th Phase JP Nagar"
+    assert resolver.resolve_one("4th Phase JP Nagra")[0] == "Other"
+
+
+def test_batch_matches_single_and_counts_match_kinds(resolver):
+    values = ["Whitefield", "whitefeild", "Adugodi", None, "JP Nagar 7th phase", "whitefeild"]
+    single = [resolver.resolve_one(value) for value in values]
+    kinds = ("exact", "fuzzy", "fallback")
+    before = [metrics.LOCATION_RESOLUTIONS.value(kind) for kind in kinds]
+    names, confidence = resolver.resolve(values)
+    after = [metrics.LOCATION_RESOLUTIONS.value(kind) for kind in kinds]
+    assert list(zip(names, confidence)) == single
+    assert [a - b for a, b in zip(after, before)] == [2, 2, 2]
+
+
+def test_edit_distance():
+    assert edit_distance("whitefeild", "whitefield", 3) == 1
+    assert edit_distance("kitten", "sitting", 5) == 3
+    assert edit_distance("abcdef", "uvwxyz", 2) == 3
+    assert edit_distance("abc", "abc", 0) == 0
@@ -0,0 +1,49 @@
+import gc
+import threading
+
+from metrics import Counter, Histogram, Registry
+
+
+def test_counts_from_many_threads_add_up():
+    counter = Counter("c", "help", labels=("kind",))
+    series = Histogram("h", "help", buckets=(1, 10)).labels()
+
+    def work():
+        for value in range(100):
+            counter.inc("a")
+            series.observe(value)
+        series.observe_many([0.5, 5])
+
+    threads = [threading.Thread(target=work) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Finished threads are folded into one accumulator, not kept one per thread
+    gc.collect()
+    assert len(counter._shards._live) <= 1
+    assert counter.value("a") == 2000
+    counts, total, count = series.snapshot()
+    assert counts == [20 * 3, 20 * 10, 20 * 89]
+    assert count == 20 * 102
+    assert total == 20 * (sum(range(100)) + 5.5)
+
+
+def test_render_prometheus_text():
+    registry = Registry()
+    registry.counter("requests_total", "Requests.", labels=("path",)).inc("/predict", amount=3)
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(2)
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{path="/predict"} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        "latency_seconds_sum 2.05",
+        "latency_seconds_count 2",
+    ]
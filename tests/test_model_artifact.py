@@ -0,0 +1,80 @@
+import zipfile
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+
+from model_artifact import export_artifact, load_artifact, read_feature_names
+from train import encode_features, load_training_frame
+
+MODELS = [
+    LinearRegression(),
+    DecisionTreeRegressor(max_depth=8, random_state=0),
+    RandomForestRegressor(n_estimators=5, max_depth=6, random_state=0),
+    GradientBoostingRegressor(n_estimators=10, max_depth=3, random_state=0),
+]
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    X, y, encoder = encode_features(load_training_frame())
+    return X[:3000], y[:3000], encoder.feature_names
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: type(model).__name__)
+def test_round_trip_predicts_like_sklearn(model, training_data, tmp_path):
+    X, y, feature_names = training_data
+    model.fit(X, y)
+    path = str(tmp_path / "model.npz")
+    export_artifact(model, feature_names, path)
+
+    loaded, loaded_names = load_artifact(path, feature_names)
+    assert loaded_names == feature_names == read_feature_names(path)
+    assert loaded.estimator == type(model).__name__
+    expected = model.predict(X)
+    np.testing.assert_allclose(loaded.predict(X), expected, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(loaded.predict(X.toarray()), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_sparse_input_is_densified_per_chunk(training_data, tmp_path, monkeypatch):
+    X, y, feature_names = training_data
+    model = DecisionTreeRegressor(max_depth=8, random_state=0).fit(X, y)
+    path = str(tmp_path / "model.npz")
+    export_artifact(model, feature_names, path)
+    loaded, _ = load_artifact(path)
+
+    densified = []
+    to_array = type(X).toarray
+    monkeypatch.setattr(type(X), "toarray", lambda self, *a, **k: densified.append(self.shape[0])
+                        or to_array(self, *a, **k))
+    np.testing.assert_allclose(loaded.predict(X, chunk_rows=700), model.predict(X))
+    assert max(densified) == 700
+
+
+def test_rejects_mismatched_or_compressed_artifacts(training_data, tmp_path):
+    X, y, feature_names = training_data
+    path = str(tmp_path / "model.npz")
+    export_artifact(LinearRegression().fit(X, y), feature_names, path)
+    with pytest.raises(ValueError, match="different feature layout"):
+        load_artifact(path, feature_names[::-1])
+
+    compressed = str(tmp_path / "compressed.npz")
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(compressed, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            dst.writestr(info.filename, src.read(info))
+    with pytest.raises(ValueError, match="compressed"):
+        load_artifact(compressed)
+
+
+def test_linear_predictor_serves_from_the_mapped_weights(predictor):
+    assert isinstance(predictor.model.coef_, np.memmap)
+    assert np.shares_memory(predictor.coef, predictor.model.coef_)
+    # Unseen categories contribute nothing: same price as the all-zero encoding
+    inputs = (1200, 2, 1, 2)
+    zero = predictor.intercept + float(np.dot(predictor.numeric_coef, inputs))
+    assert predictor.predict_price(*inputs, "Nowhere", "No Such Area") == pytest.approx(zero)
+    batch = predictor.predict_batch([dict(zip(["total_sqft", "bath", "balcony", "bhk"], inputs),
+                                          location="Nowhere", area_type="No Such Area")])
+    assert batch[0] == pytest.approx(zero)
@@ -0,0 +1,161 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+import metrics
+import model_registry
+from model_registry import ModelRegistry, ModelWatcher, ShadowPredictor, performance_row
+from predictor import INPUT_COLUMNS
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARTIFACT = os.path.join(REPO_DIR, "best_model.npz")
+RECORDS = pd.DataFrame([
+    (1200, 2, 1, 2, "Whitefield", "Super built-up  Area"),
+    (850.5, 1, 0, 1, "Electronic City Phase II", "Built-up  Area"),
+], columns=INPUT_COLUMNS)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "models"))
+    registry.register(ARTIFACT, None)
+    registry.register(ARTIFACT, None)
+    return registry
+
+
+def _break(registry, version):
+    with open(registry.artifact_path(version), "wb") as f:
+        f.write(b"not a model")
+
+
+def test_first_version_is_activated(registry):
+    assert registry.versions() == ["v0001", "v0002"]
+    assert registry.active_version() == "v0001"
+    assert registry.metadata("v0002")["performance"] is None
+
+
+def test_shadow_pointer_rules(registry):
+    with pytest.raises(ValueError):
+        registry.set_shadow("v0001")
+    with pytest.raises(ValueError):
+        registry.activate("v0009")
+    registry.set_shadow("v0002")
+    registry.activate("v0002")
+    # A promoted shadow is no longer a shadow
+    assert (registry.active_version(), registry.shadow_version()) == ("v0002", None)
+
+
+def test_watcher_swaps_on_activate(registry):
+    watcher = ModelWatcher(registry)
+    first = watcher.predictor
+    assert watcher.version == "v0001" and not watcher.check()
+    registry.activate("v0002")
+    assert watcher.check()
+    assert watcher.version == "v0002" and watcher.swaps == 1
+    # The old predictor still answers for requests that already hold it
+    np.testing.assert_allclose(first.predict_batch(RECORDS), watcher.predict_batch(RECORDS))
+
+
+def test_failed_version_is_retried(registry):
+    watcher = ModelWatcher(registry)
+    _break(registry, "v0002")
+    registry.activate("v0002")
+    failed = metrics.MODEL_SWAPS.value("failed")
+    assert not watcher.check() and not watcher.check()
+    assert watcher.version == "v0001"
+    assert metrics.MODEL_SWAPS.value("failed") == failed + 1
+    shutil.copyfile(ARTIFACT, registry.artifact_path("v0002"))
+    assert watcher.check()
+    assert watcher.version == "v0002"
+
+
+def test_failed_shadow_does_not_block_live_swap(registry):
+    version = registry.register(ARTIFACT, None)
+    watcher = ModelWatcher(registry)
+    _break(registry, version)
+    registry.set_shadow(version)
+    registry.activate("v0002")
+    assert watcher.check()
+    assert watcher.version == "v0002"
+    assert not isinstance(watcher.predictor, ShadowPredictor)
+    shutil.copyfile(ARTIFACT, registry.artifact_path(version))
+    assert watcher.check()
+    assert isinstance(watcher.predictor, ShadowPredictor)
+    assert watcher.predictor.candidate.version == version
+
+
+def test_shadow_mirrors_calls(registry):
+    registry.set_shadow("v0002")
+    watcher = ModelWatcher(registry)
+    shadow = watcher.predictor
+    assert isinstance(shadow, ShadowPredictor)
+    prices = shadow.predict_batch(RECORDS)
+    price = shadow.predict_price(*RECORDS.iloc[0])
+    np.testing.assert_allclose(prices, shadow.live.predict_batch(RECORDS))
+    assert price == pytest.approx(prices[0])
+    shadow._executor.shutdown(wait=True)
+    stats = shadow.stats()
+    assert (stats["live"], stats["candidate"]) == ("v0001", "v0002")
+    assert (stats["calls"], stats["rows"], stats["dropped"]) == (2, 3, 0)
+    # Same weights on both sides
+    assert stats["max_abs_diff"] == 0.0
+
+
+def test_performance_row_matches_params(tmp_path):
+    path = tmp_path / "model_performance.csv"
+    pd.DataFrame([
+        {"Model": "Decision Tree", "RMSE": 1.5, "R2": 0.8, "Params": json.dumps({"max_depth": 10})},
+        {"Model": "Decision Tree", "RMSE": 2.5, "R2": 0.7, "Params": json.dumps({"max_depth": 5})},
+        {"Model": "Random Forest", "RMSE": 1.0, "R2": 0.9, "Params": json.dumps({"max_depth": 5})},
+    ]).to_csv(path, index=False)
+    row = performance_row(DecisionTreeRegressor(max_depth=5), str(path))
+    assert (row["Model"], row["RMSE"]) == ("Decision Tree", 2.5)
+    assert performance_row(DecisionTreeRegressor(max_depth=7), str(path)) is None
+
+
+def test_performance_row_needs_params(tmp_path):
+    path = tmp_path / "model_performance.csv"
+    pd.DataFrame([{"Model": "Decision Tree", "RMSE": 1.5, "R2": 0.8}]).to_csv(path, index=False)
+    assert performance_row(DecisionTreeRegressor(max_depth=5), str(path)) is None
+
+
+@pytest.fixture
+def shadow_app(registry, monkeypatch):
+    """app_resources (and app.py) reading ``registry``, with v0002 in shadow."""
+    import app_resources
+
+    registry.set_shadow("v0002")
+    monkeypatch.chdir(REPO_DIR)
+    monkeypatch.setattr(model_registry.ModelRegistry.__init__, "__defaults__", (registry.root,))
+    app_resources.load_model_watcher.clear()
+    yield app_resources
+    app_resources.load_model_watcher().stop()
+    app_resources.load_model_watcher.clear()
+
+
+def test_get_predictor_in_shadow_mode(shadow_app):
+    predictor = shadow_app.get_predictor()
+    assert isinstance(predictor, ShadowPredictor)
+    prices = [predictor.predict_price(*RECORDS.iloc[0]) for _ in range(2)]
+    assert prices[0] == prices[1]
+    assert predictor.cache.stats()["hits"] >= 1
+    predictor._executor.shutdown(wait=True)
+    # Cache hits are still mirrored to the candidate
+    assert predictor.stats()["calls"] == 2
+
+
+def test_app_predicts_in_shadow_mode(shadow_app):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_DIR, "app.py"), default_timeout=120)
+    at.run()
+    at.session_state["prediction_inputs"] = {"total_sqft": 1200, "bhk": 2, "bath": 2, "balcony": 1,
+                                             "location": "Whitefield", "area_type": "Super built-up  Area"}
+    at.run()
+    assert not at.exception
+    assert any("prediction cache" in caption.value for caption in at.caption)
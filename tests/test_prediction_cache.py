@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import metrics
+
+from prediction_cache import CachedPredictor, PredictionCache
+from predictor import INPUT_COLUMNS
+
+RECORDS = pd.DataFrame([
+    (1200, 2, 1, 2, "Whitefield", "Super built-up  Area"),
+    (1200, 2, 1, 2, " Whitefield", "Super built-up  Area"),
+    (1200, 2, 1, 2, "Whitefield ", "Super built-up  Area "),
+    (850.5, 1, 0, 1, "Electronic City Phase II", "Built-up  Area"),
+    (2400, 4, 3, 4, "Nowhere In Particular", "Plot  Area"),
+    (1200, 2, 1, 2, "Whitefield", "Super built-up  Area"),
+], columns=INPUT_COLUMNS)
+
+
+def test_cached_prices_match_uncached(predictor):
+    cached = CachedPredictor(predictor, PredictionCache())
+    expected = [predictor.predict_price(*row) for row in RECORDS.itertuples(index=False)]
+    # Twice: the first pass fills the cache, the second answers from it
+    for _ in range(2):
+        assert [cached.predict_price(*row) for row in RECORDS.itertuples(index=False)] == pytest.approx(expected)
+        np.testing.assert_allclose(cached.predict_batch(RECORDS), expected)
+    assert cached.cache.hits > 0
+
+
+def test_batch_hits_single_entries(predictor):
+    cache = PredictionCache()
+    cached = CachedPredictor(predictor, cache)
+    cached.predict_price(*RECORDS.iloc[0])
+    before = [metrics.CACHE_LOOKUPS.value(result) for result in ("hit", "miss")]
+    cached.predict_batch(RECORDS.iloc[:2])
+    # Row 0 was cached by predict_price; row 1 has a different location string
+    assert (cache.hits, cache.misses) == (1, 2)
+    after = [metrics.CACHE_LOOKUPS.value(result) for result in ("hit", "miss")]
+    assert [a - b for a, b in zip(after, before)] == [1, 1]
+
+
+def test_lru_eviction():
+    cache = PredictionCache(maxsize=2)
+    cache.put("a", 1.0)
+    cache.put("b", 2.0)
+    assert cache.get("a") == 1.0
+    cache.put("c", 3.0)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1.0, 3.0)
+    assert len(cache) == 2
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+from prediction_service import PredictionService
+
+RECORD = {"total_sqft": 1200, "bath": 2, "balcony": 1, "bhk": 2,
+          "location": "Whitefield", "area_type": "Super built-up  Area"}
+
+
+def exchange(service, raw):
+    """Send raw request bytes to a live service; returns (status, headers, body)."""
+    async def run():
+        service.batcher.start()
+        server = await asyncio.start_server(service.serve_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 10)
+            writer.close()
+            return response
+        finally:
+            server.close()
+            await service.batcher.stop()
+
+    head, _, body = asyncio.run(run()).partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode().split("\r\n")
+    headers = dict(line.lower().split(": ", 1) for line in header_lines)
+    return int(status_line.split()[1]), headers, body
+
+
+def post(path, body, length=None):
+    length = len(body) if length is None else length
+    return (f"POST {path} HTTP/1.1\r\nContent-Length: {length}\r\nConnection: close\r\n\r\n".encode()
+            + body)
+
+
+def test_predict(predictor):
+    status, _, body = exchange(PredictionService(predictor), post("/predict", json.dumps(RECORD).encode()))
+    assert status == 200
+    assert json.loads(body)["price"] == pytest.approx(predictor.predict_price(
+        1200, 2, 1, 2, "Whitefield", "Super built-up  Area"))
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1_0", "²"])
+def test_invalid_content_length_is_a_400(predictor, length):
+    raw = f"POST /predict HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode("latin-1")
+    status, headers, body = exchange(PredictionService(predictor), raw)
+    assert status == 400
+    assert headers["connection"] == "close"
+    assert json.loads(body) == {"error": "invalid Content-Length"}
+
+
+def test_internal_errors_are_not_echoed(predictor, caplog):
+    class Broken:
+        def __getattr__(self, name):
+            return getattr(predictor, name)
+
+        def predict_batch(self, records):
+            raise RuntimeError("secret internals")
+
+    status, _, body = exchange(PredictionService(Broken()), post("/predict", json.dumps(RECORD).encode()))
+    assert status == 500
+    assert json.loads(body) == {"error": "internal server error"}
+    assert "secret internals" in caplog.text
+
+
+@pytest.mark.parametrize("value", ["NaN", "Infinity", "-Infinity", "1e400", "1" + "0" * 400])
+def test_non_finite_numbers_are_a_400(predictor, value):
+    body = json.dumps(RECORD).replace('"total_sqft": 1200', f'"total_sqft": {value}').encode()
+    status, _, payload = exchange(PredictionService(predictor), post("/predict", body))
+    assert status == 400
+    assert json.loads(payload) == {"error": "total_sqft must be a finite number"}
+
+
+def test_a_failing_record_only_fails_its_own_request(predictor):
+    class RejectsThirteenBaths:
+        def __getattr__(self, name):
+            return getattr(predictor, name)
+
+        def predict_batch(self, records):
+            if (records["bath"] == 13).any():
+                raise ValueError("bad record")
+            return predictor.predict_batch(records)
+
+    service = PredictionService(RejectsThirteenBaths(), max_wait=0.5)
+
+    async def run():
+        service.batcher.start()
+        try:
+            return await asyncio.gather(service.batcher.submit([RECORD]),
+                                        service.batcher.submit([dict(RECORD, bath=13)]),
+                                        service.batcher.submit([RECORD, RECORD]), return_exceptions=True)
+        finally:
+            await service.batcher.stop()
+
+    good, bad, pair = asyncio.run(run())
+    expected = predictor.predict_price(1200, 2, 1, 2, "Whitefield", "Super built-up  Area")
+    assert good == pytest.approx([expected])
+    assert pair == pytest.approx([expected, expected])
+    assert isinstance(bad, ValueError)
@@ -0,0 +1,33 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_outliers import (
+    reference_remove_bhk_outliers, reference_remove_pps_outliers, synthetic_cleaned)
+from preprocessing import (
+    AFTER_OUTLIERS_PATH, BEFORE_OUTLIERS_PATH, parse_total_sqft, remove_bhk_outliers, remove_outliers,
+    remove_pps_outliers)
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("n_rows, n_locations, seed", [(2_000, 250, 0), (5_000, 40, 1), (300, 200, 2)])
+def test_outlier_filters_match_notebook_loops(n_rows, n_locations, seed):
+    df = synthetic_cleaned(n_rows, n_locations, seed)
+    pps = remove_pps_outliers(df)
+    pd.testing.assert_frame_equal(pps, reference_remove_pps_outliers(df))
+    pd.testing.assert_frame_equal(remove_bhk_outliers(pps), reference_remove_bhk_outliers(pps))
+
+
+def test_remove_outliers_reproduces_shipped_dataset():
+    before = pd.read_csv(os.path.join(REPO_DIR, BEFORE_OUTLIERS_PATH))
+    after = pd.read_csv(os.path.join(REPO_DIR, AFTER_OUTLIERS_PATH))
+    pd.testing.assert_frame_equal(remove_outliers(before).reset_index(drop=True), after, check_exact=False)
+
+
+def test_parse_total_sqft():
+    raw = pd.Series(["1200", "1100 - 1450", "34.46Sq. Meter", "2Acres", "abc", None], dtype=object)
+    parsed = parse_total_sqft(raw)
+    assert parsed[:4].tolist() == pytest.approx([1200.0, 1275.0, 34.46 * 10.7639, 2 * 43560.0])
+    assert parsed[4:].isna().all()
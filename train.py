@@ -0,0 +1,228 @@
+# ============================================================
+# MODEL TRAINING SCRIPT
+# Script version of the notebook's "MODEL TRAINING SCRIPT (FINAL VERSION)"
+# cell, training on a sparse (CSR) one-hot feature matrix.
+#
+# Every candidate model x hyperparameter setting is scored with k-fold
+# cross-validation; (candidate, fold) jobs run on a process pool. The encoded
+# matrix is cached under .feature_cache/ keyed by a hash of the data file,
+# so retraining on unchanged data skips encoding.
+#
+#   python train.py                       # after_outlier_removal.csv → best_model.pkl
+#   python train.py --models "Linear Regression" "Decision Tree" --folds 10
+#   python train.py --dense               # same, with a dense matrix for comparison
+# ============================================================
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from sklearn.model_selection import KFold, ParameterGrid
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+
+from dataset_cache import load_dataset
+from features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, FeatureEncoder, normalize_availability
+from model_artifact import ARTIFACT_PATH, export_artifact
+from model_registry import REGISTRY_DIR, ModelRegistry, performance_row
+from preprocessing import AFTER_OUTLIERS_PATH
+
+TARGET = "price"
+CACHE_DIR = ".feature_cache"
+# Bump when the encoding changes so stale cached matrices are not reused
+ENCODING_VERSION = 1
+
+# Candidate estimators and the hyperparameter grid searched for each
+CANDIDATES = {
+    # lsqr (used for sparse input) needs a tight tol to match the dense solution;
+    # LinearRegression takes tol from scikit-learn 1.7 (pinned in requirements.txt)
+    "Linear Regression": (LinearRegression, {"tol": [1e-14]}),
+    "Decision Tree": (DecisionTreeRegressor, {
+        "max_depth": [None, 10, 20], "min_samples_leaf": [1, 5], "random_state": [42]}),
+    "Random Forest": (RandomForestRegressor, {
+        "n_estimators": [200], "max_features": [1.0, 0.5], "random_state": [42]}),
+    "Gradient Boosting": (GradientBoostingRegressor, {
+        "n_estimators": [100, 300], "learning_rate": [0.05, 0.1], "random_state": [42]}),
+}
+
+_worker_data = None
+
+
+def load_training_frame(path=AFTER_OUTLIERS_PATH):
+    """Cleaned listings with availability collapsed to Ready To Move / Future Possession."""
+    df = load_dataset(path)
+    df["availability"] = normalize_availability(df["availability"])
+    # price_per_sqft is derived from the target, so it would leak
+    return df.drop(columns=["price_per_sqft"], errors="ignore")
+
+
+def encode_features(df, dense=False):
+    """Feature matrix, target and the encoder that defines feature_names."""
+    X = df[[c for c in CATEGORICAL_COLUMNS + NUMERIC_COLUMNS if c in df.columns]]
+    encoder = FeatureEncoder.fit(X)
+    matrix = encoder.transform_dense(X) if dense else encoder.transform(X)
+    return matrix, df[TARGET].to_numpy(dtype=float), encoder
+
+
+def dataset_hash(path):
+    digest = hashlib.blake2b(f"encoding-v{ENCODING_VERSION}".encode(), digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_feature_cache(cache_path, X, y, feature_names):
+    tmp_path = cache_path + ".tmp.npz"
+    np.savez(tmp_path, data=X.data, indices=X.indices, indptr=X.indptr, shape=X.shape, y=y,
+             feature_names=json.dumps(feature_names))
+    os.replace(tmp_path, cache_path)
+
+
+def read_feature_cache(cache_path):
+    with np.load(cache_path) as data:
+        X = sp.csr_matrix((data["data"], data["indices"], data["indptr"]), shape=tuple(data["shape"]))
+        return X, data["y"], json.loads(str(data["feature_names"]))
+
+
+def load_or_encode(path, cache_dir=CACHE_DIR):
+    """Return (cache file, X, y, feature_names), encoding only on a cache miss."""
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(cache_dir, f"{dataset_hash(path)}.npz")
+    if os.path.exists(cache_path):
+        X, y, feature_names = read_feature_cache(cache_path)
+        print(f"✔ Using cached feature matrix → {cache_path}")
+        return cache_path, X, y, feature_names
+
+    X, y, encoder = encode_features(load_training_frame(path))
+    write_feature_cache(cache_path, X, y, encoder.feature_names)
+    print(f"✔ Encoded and cached feature matrix → {cache_path}")
+    return cache_path, X, y, encoder.feature_names
+
+
+def matrix_nbytes(X):
+    if sp.issparse(X):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    return X.nbytes
+
+
+def _init_worker(cache_path, dense):
+    global _worker_data
+    X, y, _ = read_feature_cache(cache_path)
+    _worker_data = (X.toarray() if dense else X, y)
+
+
+def evaluate_fold(name, params, train_idx, test_idx):
+    """Fit one candidate on one fold; returns metrics and timings."""
+    X, y = _worker_data
+    model = CANDIDATES[name][0](**params)
+    start = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    preds = model.predict(X[test_idx])
+    predict_s = time.perf_counter() - start
+    return {
+        "RMSE": np.sqrt(mean_squared_error(y[test_idx], preds)),
+        "MAE": mean_absolute_error(y[test_idx], preds),
+        "R2": r2_score(y[test_idx], preds),
+        "fit_s": fit_s,
+        "predict_s": predict_s,
+        "predict_us_per_row": predict_s / len(test_idx) * 1e6,
+    }
+
+
+def cross_validate(cache_path, n_rows, model_names, folds=5, workers=None, dense=False):
+    """Score every (candidate, params) with k-fold CV on a process pool."""
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=42).split(np.arange(n_rows)))
+    jobs = [(name, params, fold)
+            for name in model_names
+            for params in ParameterGrid(CANDIDATES[name][1])
+            for fold in range(folds)]
+    print(f"Running {len(jobs)} fits ({folds}-fold CV) on {workers or os.cpu_count()} workers...")
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(cache_path, dense)) as pool:
+        futures = [pool.submit(evaluate_fold, name, params, *splits[fold]) for name, params, fold in jobs]
+        fold_results = [dict(model=name, params=json.dumps(params, sort_keys=True), **future.result())
+                        for (name, params, _), future in zip(jobs, futures)]
+
+    scores = pd.DataFrame(fold_results)
+    report = (scores.groupby(["model", "params"], sort=False)
+              .agg(RMSE=("RMSE", "mean"), RMSE_std=("RMSE", "std"), MAE=("MAE", "mean"), R2=("R2", "mean"),
+                   fit_s=("fit_s", "mean"), predict_s=("predict_s", "mean"),
+                   predict_us_per_row=("predict_us_per_row", "mean"))
+              .reset_index()
+              .rename(columns={"model": "Model", "params": "Params"}))
+    report["Folds"] = folds
+    # Original Model/RMSE/MAE/R2 columns first, extended fields after
+    return report[["Model", "RMSE", "MAE", "R2", "RMSE_std", "Params", "fit_s", "predict_s",
+                   "predict_us_per_row", "Folds"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validate, select and export the house price model.")
+    parser.add_argument("--data", default=AFTER_OUTLIERS_PATH)
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--models", nargs="+", default=list(CANDIDATES), choices=list(CANDIDATES))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--dense", action="store_true", help="use a dense feature matrix")
+    parser.add_argument("--register", metavar="REGISTRY_DIR", nargs="?", const=REGISTRY_DIR,
+                        help="also add the best model to a model registry (default: models/)")
+    parser.add_argument("--activate", action="store_true", help="with --register, make it the active version")
+    args = parser.parse_args(argv)
+    wall_start = time.perf_counter()
+
+    print("\n📌 Loading & encoding cleaned dataset...")
+    start = time.perf_counter()
+    cache_path, X, y, feature_names = load_or_encode(args.data, args.cache_dir)
+    if args.dense:
+        X = X.toarray()
+    print(f"Total encoded features: {len(feature_names)}  rows: {X.shape[0]}  "
+          f"({'dense' if args.dense else 'CSR'}: {matrix_nbytes(X) / 1e6:.2f} MB, "
+          f"{time.perf_counter() - start:.2f}s)")
+
+    print("\n🚀 Cross-validating candidate models...\n")
+    report = cross_validate(cache_path, X.shape[0], args.models, args.folds, args.workers, args.dense)
+    report = report.sort_values("RMSE", kind="stable").reset_index(drop=True)
+    report.to_csv(os.path.join(args.output_dir, "model_performance.csv"), index=False)
+    print(report.to_string(index=False, float_format="%.4f"))
+
+    # Refit the winner on all rows and export it
+    best = report.iloc[0]
+    best_model = CANDIDATES[best["Model"]][0](**json.loads(best["Params"]))
+    best_model.fit(X, y)
+    with open(os.path.join(args.output_dir, "best_model.pkl"), "wb") as f:
+        pickle.dump(best_model, f)
+    with open(os.path.join(args.output_dir, "feature_names.pkl"), "wb") as f:
+        pickle.dump(feature_names, f)
+    export_artifact(best_model, feature_names, os.path.join(args.output_dir, ARTIFACT_PATH))
+
+    print(f"\n🏆 BEST MODEL SELECTED → {best['Model']} {best['Params']}")
+    print(f"✔ Saved → best_model.pkl, feature_names.pkl, {ARTIFACT_PATH}, model_performance.csv "
+          f"in {args.output_dir}")
+    if args.register:
+        registry = ModelRegistry(args.register)
+        # The winner's own row: matched on its hyperparameters, not just its model family
+        performance = performance_row(best_model, os.path.join(args.output_dir, "model_performance.csv"))
+        version = registry.register(os.path.join(args.output_dir, ARTIFACT_PATH), None, performance,
+                                    source="train.py", activate=args.activate)
+        print(f"✔ Registered → {version} in {args.register}"
+              f"{' (active)' if registry.active_version() == version else ''}")
+    print(f"Total wall-clock: {time.perf_counter() - wall_start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()